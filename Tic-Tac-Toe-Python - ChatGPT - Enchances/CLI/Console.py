@@ -0,0 +1,70 @@
+import sys
+from typing import Optional, TextIO, Tuple
+from Game.Board import Board, GameState
+from Game.Move import Move
+from Game.Player import Player
+from Game.Strategies import Strategy
+
+# Plays a game on the terminal. Only the Game package is loaded, so this
+# works on machines without a display or Tk. A seat with a strategy plays
+# by itself; a seat without one reads "row col" (0-based) from the input.
+
+class ConsoleGame:
+    def __init__(self, size: int = 3, win_length: Optional[int] = None,
+                 strategies: Tuple[Optional[Strategy], Optional[Strategy]] = (None, None),
+                 stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout):
+        self.board = Board(size, win_length)
+        self.players = (Player("X", "Player X"), Player("O", "Player O"))
+        self.strategies = strategies
+        self.stdin = stdin
+        self.stdout = stdout
+
+    def show(self) -> None:
+        size = self.board.size
+        rows = []
+        for r in range(size):
+            rows.append(" | ".join(self.board.cell(r, c) or "." for c in range(size)))
+        self.stdout.write("\n" + ("\n" + "-" * (4*size - 3) + "\n").join(rows) + "\n\n")
+
+    def ask(self, player: Player) -> Optional[Tuple[int, int]]:
+        # None when the input runs out
+        while True:
+            self.stdout.write(f"{player.getName()} ({player.getSymbol()}), row col: ")
+            self.stdout.flush()
+            line = self.stdin.readline()
+            if not line:
+                return None
+            try:
+                row, col = (int(part) for part in line.split())
+            except ValueError:
+                self.stdout.write("Enter two numbers, e.g. 1 2\n")
+                continue
+            if not (0 <= row < self.board.size and 0 <= col < self.board.size):
+                self.stdout.write("That cell is off the board\n")
+            elif not self.board.is_free(row, col):
+                self.stdout.write("That cell is taken\n")
+            else:
+                return row, col
+
+    def play(self, first: int = 0) -> Optional[str]:
+        # Returns the winning symbol, or None for a draw or abandoned game
+        turn = first
+        self.show()
+        while self.board.state == GameState.RUNNING:
+            player = self.players[turn]
+            strategy = self.strategies[turn]
+            cell = strategy(self.board, player) if strategy else self.ask(player)
+            if cell is None:
+                return None
+            self.board.make(Move.of(cell[0], cell[1], player))
+            if strategy:
+                self.stdout.write(f"{player.getName()} plays {cell[0]} {cell[1]}\n")
+            self.show()
+            if self.board.state == GameState.RUNNING:
+                turn ^= 1
+        if self.board.state == GameState.WIN:
+            winner = self.players[turn]
+            self.stdout.write(f"{winner.getName()} wins!\n")
+            return winner.getSymbol()
+        self.stdout.write("It's a draw!\n")
+        return None
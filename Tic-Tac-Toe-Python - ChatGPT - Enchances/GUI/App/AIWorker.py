@@ -0,0 +1,102 @@
+import queue
+import threading
+from typing import Callable, Optional, Tuple
+from Game.AI.Search import AlphaBeta
+from Game.AI.SolutionTable import SolutionTable
+from Game.Board import Board
+from Game.Player import Player
+
+def engine_for(size: int, win_length: int):
+    # The classic board is solved ahead of time (Game/AI/SolutionTable.py),
+    # so it is looked up rather than searched; other boards are searched
+    if (size, win_length) == (3, 3):
+        return SolutionTable()
+    return AlphaBeta(size, win_length)
+
+class AIWorker:
+    # Runs the computer's move search off the Tk thread.
+    #
+    # request() copies the board and starts the engine on a daemon thread;
+    # the chosen cell comes back through a queue that the Tk thread polls
+    # with after(), so the window keeps handling events while the engine
+    # thinks. cancel() sets the search's stop event, which the engines check
+    # as they go, and any answer from an older request is dropped. If the
+    # engine raises, the exception is handed to on_error on the Tk thread
+    # (by default Tk's report_callback_exception, which prints it).
+    def __init__(self, widget, engine, on_move: Callable[[Tuple[int,int]], None], poll_ms: int = 20,
+                 on_error: Optional[Callable[[BaseException], None]] = None):
+        self.widget = widget
+        self.engine = engine
+        self.on_move = on_move
+        self.on_error = on_error
+        self.poll_ms = poll_ms
+        # (request id, chosen cell, exception raised by the engine)
+        self.results: "queue.Queue[Tuple[int, Optional[Tuple[int,int]], Optional[BaseException]]]" = queue.Queue()
+        self.request_id = 0
+        self.stop: Optional[threading.Event] = None
+        self.thread: Optional[threading.Thread] = None
+        self.poll_id: Optional[str] = None
+
+    @property
+    def busy(self) -> bool:
+        return self.stop is not None
+
+    def request(self, board: Board, player: Player, opponent: Player) -> None:
+        self.cancel()
+        # The engine is not shared between searches, so wait for the old one
+        # on the Tk thread. This blocks only briefly because every engine
+        # polls the stop event as it goes: AlphaBeta every 1024 nodes, MCTS
+        # every 32 playouts. An engine that never checks it would freeze the
+        # window until its search finished.
+        if self.thread is not None:
+            self.thread.join()
+        self.request_id += 1
+        self.stop = threading.Event()
+        self.thread = threading.Thread(
+            target=self._search,
+            args=(self.request_id, board.copy(), player, opponent, self.stop),
+            name="ai-worker",
+            daemon=True
+        )
+        self.thread.start()
+        self.poll_id = self.widget.after(self.poll_ms, self.poll)
+
+    def _search(self, request_id: int, board: Board, player: Player, opponent: Player,
+                stop: threading.Event) -> None:
+        cell, error = None, None
+        try:
+            cell = self.engine.best_move(board, player, opponent, stop=stop)
+        except Exception as e:
+            error = e
+        self.results.put((request_id, cell, error))
+
+    def poll(self) -> None:
+        self.poll_id = None
+        while True:
+            try:
+                request_id, cell, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if request_id == self.request_id and self.stop is not None:
+                self.stop = None
+                if error is not None:
+                    self.report(error)
+                elif cell is not None:
+                    self.on_move(cell)
+                return
+        if self.stop is not None:
+            self.poll_id = self.widget.after(self.poll_ms, self.poll)
+
+    def report(self, error: BaseException) -> None:
+        if self.on_error is not None:
+            self.on_error(error)
+        else:
+            self.widget.report_callback_exception(type(error), error, error.__traceback__)
+
+    def cancel(self) -> None:
+        if self.stop is not None:
+            self.stop.set()
+            self.stop = None
+        if self.poll_id is not None:
+            self.widget.after_cancel(self.poll_id)
+            self.poll_id = None
@@ -0,0 +1,86 @@
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+# An animation is called once per frame with the seconds since it started
+# and returns False once it has finished.
+Animation = Callable[[float], bool]
+
+def blend(start: str, end: str, t: float) -> str:
+    # Linear mix of two '#rrggbb' colors, t in [0, 1]
+    t = min(max(t, 0.0), 1.0)
+    a = [int(start[i:i+2], 16) for i in (1, 3, 5)]
+    b = [int(end[i:i+2], 16) for i in (1, 3, 5)]
+    return '#' + ''.join(f'{round(x + (y - x) * t):02x}' for x, y in zip(a, b))
+
+class FrameScheduler:
+    # Owns every running animation of one window and drives them all from a
+    # single Tk timer at a fixed frame rate.
+    #
+    # Frames are placed on a fixed grid from when the scheduler woke up; if
+    # Tk falls behind, the missed frames are skipped rather than run late,
+    # and animations see the real elapsed time so they stay in step. The
+    # timer only runs while something is animating, so an idle window costs
+    # nothing no matter how many games have been played.
+    def __init__(self, widget, fps: int = 30):
+        self.widget = widget
+        self.frame_time = 1.0 / fps
+        self.animations: Dict[Hashable, Tuple[Animation, float]] = {}
+        self.after_id: Optional[str] = None
+        self.ticking = False
+        self.epoch = 0.0
+        self.frame = 0
+        self.dropped = 0
+
+    def add(self, key: Hashable, animation: Animation) -> None:
+        # Starting an animation under a key that is already running replaces it
+        now = time.monotonic()
+        self.animations[key] = (animation, now)
+        animation(0.0)
+        if self.after_id is None and not self.ticking:
+            self.epoch = now
+            self.frame = 0
+            self.after_id = self.widget.after(int(self.frame_time * 1000), self.tick)
+
+    def cancel(self, key: Hashable) -> None:
+        self.animations.pop(key, None)
+        if not self.animations:
+            self._stop_timer()
+
+    def cancel_all(self) -> None:
+        self.animations.clear()
+        self._stop_timer()
+
+    def is_running(self, key: Hashable) -> bool:
+        return key in self.animations
+
+    def _stop_timer(self) -> None:
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def tick(self) -> None:
+        self.after_id = None
+        self.ticking = True
+        now = time.monotonic()
+
+        # Skip any frames whose slot has already passed
+        due = int((now - self.epoch) / self.frame_time)
+        if due > self.frame + 1:
+            self.dropped += due - self.frame - 1
+        self.frame = max(due, self.frame + 1)
+
+        try:
+            for key, entry in list(self.animations.items()):
+                # An animation may have been cancelled or replaced by another
+                # one earlier in this frame
+                if self.animations.get(key) is not entry:
+                    continue
+                animation, started = entry
+                if not animation(now - started) and self.animations.get(key) is entry:
+                    del self.animations[key]
+        finally:
+            self.ticking = False
+
+        if self.animations:
+            delay = self.epoch + (self.frame + 1) * self.frame_time - time.monotonic()
+            self.after_id = self.widget.after(max(1, int(delay * 1000)), self.tick)
@@ -3,9 +3,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox, font as tkfont
 import random
 import math
-from Game.Board import Board, GameState
+from Game.Board import Board, BoardEvent, GameState
 from Game.Player import Player
 from Game.Move import Move
+from GUI.App.BoardCanvas import BoardCanvas
+from GUI.App.Animator import FrameScheduler, blend
+from GUI.App.AIWorker import AIWorker, engine_for
+from Game.Stats import StatsStore, GameEvent, new_totals, update_totals, win_rate, variant_name
 
 # Color scheme
 COLORS = {
@@ -30,6 +34,14 @@ FONTS = {
     'status': ('Helvetica', 12, 'bold')
 }
 
+# Animation timing (frames per second, durations in seconds)
+ANIMATION = {
+    'fps': 30,
+    'hover': 0.12,
+    'place': 0.2,
+    'win_pulse': 3.0
+}
+
 class TicTacToeApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -49,28 +61,43 @@ class TicTacToeApp(tk.Tk):
         
         # Game state
         self.game_active = True
-        self.animation_ids = []
+        # Every running animation (hover, move placement, win pulse) is
+        # driven by this one scheduler
+        self.animator = FrameScheduler(self, fps=ANIMATION['fps'])
         
         # Players
         self.player_x = Player("X", "Player X")
         self.player_o = Player("O", "Player O")
         self.current_player = self.player_x
         
-        # Game statistics
-        self.stats = {
-            'total_games': 0,
-            'x_wins': 0,
-            'o_wins': 0,
-            'draws': 0,
-            'win_streak': 0,
-            'max_win_streak': 0
-        }
-        
-        # Board
+        # Board; the UI follows it through its change events
         self.board = Board()
+        self.board.subscribe(self.on_board_event)
+        
+        # Computer opponent: the player it moves for (None when off) and the
+        # background worker that searches for its moves
+        self.computer = None
+        self.ai = AIWorker(self, engine_for(self.board.size, self.board.win_length), self.on_computer_move,
+                           on_error=self.on_computer_error)
+        
+        # Game statistics: totals for this variant are loaded once by the
+        # stats store's thread and then kept up to date in memory; results
+        # finished before they arrive wait in pending_results
+        self.variant = variant_name(self.board.size, self.board.win_length)
+        self.stats_store = StatsStore()
+        self.stats = new_totals()
+        self.pending_results = []
+        
+        # Moves taken back with Undo, most recent last
+        self.redo_moves = []
+        
+        # Last text set on each label, so unchanged labels are not redrawn
+        self.label_texts = {}
         
         # Create UI
         self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.wait_for(self.stats_store.variant_totals(self.variant), self.on_totals_loaded)
         
     def create_widgets(self):
         # Main container
@@ -94,7 +121,7 @@ class TicTacToeApp(tk.Tk):
         # Score labels
         self.score_x = ttk.Label(
             self.score_frame,
-            text="X: 0",
+            text=f"X: {self.stats['x_wins']}",
             font=FONTS['score'],
             foreground=COLORS['x_color'],
             background=COLORS['score_bg'],
@@ -114,7 +141,7 @@ class TicTacToeApp(tk.Tk):
         
         self.score_o = ttk.Label(
             self.score_frame,
-            text="O: 0",
+            text=f"O: {self.stats['o_wins']}",
             font=FONTS['score'],
             foreground=COLORS['o_color'],
             background=COLORS['score_bg'],
@@ -136,29 +163,21 @@ class TicTacToeApp(tk.Tk):
         self.board_frame = ttk.Frame(self.main_frame, style='Board.TFrame')
         self.board_frame.pack(pady=10)
         
-        # Create game board buttons
-        self.buttons = [[None]*3 for _ in range(3)]
-        for r in range(3):
-            for c in range(3):
-                btn = tk.Button(
-                    self.board_frame,
-                    text="",
-                    font=FONTS['button'],
-                    width=3,
-                    height=1,
-                    bg=COLORS['button_bg'],
-                    fg=COLORS['text'],
-                    relief='ridge',
-                    borderwidth=2,
-                    command=lambda row=r, col=c: self.make_move(row, col)
-                )
-                btn.grid(row=r, column=c, padx=2, pady=2, ipadx=10, ipady=10)
-                
-                # Add hover effects
-                btn.bind('<Enter>', lambda e, b=btn: self.on_enter(e, b))
-                btn.bind('<Leave>', lambda e, b=btn: self.on_leave(e, b))
-                
-                self.buttons[r][c] = btn
+        # Game board, drawn on a single canvas; clicks and hover are
+        # mapped to cells by the canvas itself
+        self.board_canvas = BoardCanvas(
+            self.board_frame,
+            size=self.board.size,
+            cell_px=100,
+            gap=4,
+            font=FONTS['button'],
+            bg=COLORS['board_bg'],
+            cell_bg=COLORS['button_bg'],
+            fg=COLORS['text'],
+            on_click=self.make_move,
+            on_hover=self.on_hover
+        )
+        self.board_canvas.pack()
         
         # Control buttons frame
         self.control_frame = ttk.Frame(self.main_frame)
@@ -173,6 +192,23 @@ class TicTacToeApp(tk.Tk):
         )
         self.restart_btn.pack(side=tk.LEFT, padx=5)
         
+        # Undo / redo buttons
+        self.undo_btn = ttk.Button(
+            self.control_frame,
+            text="Undo",
+            command=self.undo_move,
+            style='TButton'
+        )
+        self.undo_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.redo_btn = ttk.Button(
+            self.control_frame,
+            text="Redo",
+            command=self.redo_move,
+            style='TButton'
+        )
+        self.redo_btn.pack(side=tk.LEFT, padx=5)
+        
         # Stats button
         self.stats_btn = ttk.Button(
             self.control_frame,
@@ -182,6 +218,17 @@ class TicTacToeApp(tk.Tk):
         )
         self.stats_btn.pack(side=tk.LEFT, padx=5)
         
+        # Computer opponent toggle
+        self.vs_computer = tk.BooleanVar(value=False)
+        self.computer_check = ttk.Checkbutton(
+            self.main_frame,
+            text="Play against the computer (O)",
+            variable=self.vs_computer,
+            command=self.toggle_computer,
+            style='Status.TCheckbutton'
+        )
+        self.computer_check.pack(pady=(10, 0))
+        
         # Configure styles
         self.configure_styles()
         
@@ -191,6 +238,11 @@ class TicTacToeApp(tk.Tk):
         self.style.configure('Board.TFrame', background=COLORS['board_bg'])
         self.style.configure('Score.TFrame', background=COLORS['score_bg'])
         
+        self.style.configure('Status.TCheckbutton',
+                           font=FONTS['status'],
+                           background=COLORS['bg'],
+                           foreground='white')
+        
         # Configure button styles
         self.style.configure('TButton',
                            font=FONTS['status'],
@@ -219,84 +271,203 @@ class TicTacToeApp(tk.Tk):
     # Event Handlers
     # -------------------
     
-    def on_enter(self, e, button):
-        if button['state'] == 'normal' and button['text'] == '':
-            button['bg'] = COLORS['button_hover']
+    def on_hover(self, old_cell, new_cell):
+        # Preview the current player's symbol on the empty cell under the mouse
+        self.animator.cancel('hover')
+        if old_cell is not None and self.board.is_free(*old_cell):
+            self.board_canvas.clear_cell(*old_cell)
+        if (new_cell is not None and self.game_active and self.current_player is not self.computer
+                and self.board.is_free(*new_cell)):
             symbol = self.current_player.getSymbol()
-            button['text'] = symbol
             # Use a lighter shade for the hover effect instead of transparency
-            if symbol == 'X':
-                button['fg'] = '#ff6b6b'  # Lighter red for X
-            else:
-                button['fg'] = '#6bb9ff'  # Lighter blue for O
-    
-    def on_leave(self, e, button):
-        if button['state'] == 'normal' and button['text'] == self.current_player.getSymbol():
-            button['bg'] = COLORS['button_bg']
-            button['text'] = ''
+            light = '#ff6b6b' if symbol == 'X' else '#6bb9ff'  # Lighter red for X, lighter blue for O
+            
+            def fade_in(elapsed):
+                progress = elapsed / ANIMATION['hover']
+                self.board_canvas.set_cell(
+                    *new_cell,
+                    text=symbol,
+                    fg=blend(COLORS['button_bg'], light, progress),
+                    bg=blend(COLORS['button_bg'], COLORS['button_hover'], progress)
+                )
+                return progress < 1
             
-    def animate_win(self, buttons, step=0):
-        if not buttons or not self.game_active:
+            self.animator.add('hover', fade_in)
+            
+    def animate_place(self, row, col, symbol):
+        # Fade the placed symbol in from the cell background
+        color = COLORS['x_color'] if symbol == 'X' else COLORS['o_color']
+        
+        def fade_in(elapsed):
+            progress = elapsed / ANIMATION['place']
+            self.board_canvas.set_cell(
+                row, col,
+                text=symbol,
+                fg=blend(COLORS['button_bg'], color, progress),
+                bg=COLORS['button_bg']
+            )
+            return progress < 1
+        
+        self.animator.add(('place', row, col), fade_in)
+        
+    def animate_win(self, cells):
+        if not cells:
             return
             
-        # Calculate pulse intensity (0.5 to 1.0)
-        intensity = 0.75 + 0.25 * (1 + math.sin(step * 0.2))
-        
-        # Convert base color to RGB
-        r, g, b = [int(x * intensity) for x in (46, 204, 113)]  # Base color: #2ecc71
-        color = f'#{r:02x}{g:02x}{b:02x}'
-        
-        # Apply to all winning buttons
-        for btn in buttons:
-            btn.config(bg=color, fg='white')
-        
-        # Schedule next animation frame
-        self.after(50, lambda: self.animate_win(buttons, step + 1))
+        def pulse(elapsed):
+            # Pulse intensity (0.75 to 1.25), settling on the base color
+            done = elapsed >= ANIMATION['win_pulse']
+            intensity = 1.0 if done else 0.75 + 0.25 * (1 + math.sin(elapsed * 4))
+            
+            # Convert base color to RGB
+            r, g, b = [min(255, int(x * intensity)) for x in (46, 204, 113)]  # Base color: #2ecc71
+            color = f'#{r:02x}{g:02x}{b:02x}'
+            
+            # Apply to all winning cells
+            for r, c in cells:
+                self.board_canvas.set_cell(r, c, bg=color, fg='white')
+            return not done
+        
+        # A finished placement fade must not overwrite the pulse
+        for r, c in cells:
+            self.animator.cancel(('place', r, c))
+        self.animator.add('win', pulse)
             
     def stop_animations(self):
-        self.game_active = False  # This will stop the animation loop
+        self.animator.cancel_all()
+    
+    def on_board_event(self, event, data):
+        # Only the widgets touched by the change are updated
+        if event == BoardEvent.CELL:
+            row, col, symbol = data
+            if symbol == self.board.blank_sym:
+                self.animator.cancel(('place', row, col))
+                self.board_canvas.clear_cell(row, col)
+            else:
+                # The hover preview gives way to the placement fade
+                self.animator.cancel('hover')
+                self.animate_place(row, col, symbol)
+        elif event == BoardEvent.STATE:
+            state, win_line = data
+            if state == GameState.WIN:
+                self.animate_win(list(win_line))
+        elif event == BoardEvent.RESET:
+            self.board_canvas.reset()
     
     # -------------------
     # Game Logic
     # -------------------
 
-    # -------------------
-    # Game logic
-    # -------------------
+    def set_label(self, label, text):
+        if self.label_texts.get(label) != text:
+            self.label_texts[label] = text
+            label.config(text=text)
 
     def update_status(self):
         player_name = self.current_player.getName()
         symbol = self.current_player.getSymbol()
-        self.status_label.config(text=f"{player_name}'s Turn ({symbol})")
-        
-        # Update score display
-        self.score_x.config(text=f"X: {self.stats['x_wins']}")
-        self.score_o.config(text=f"O: {self.stats['o_wins']}")
-        self.score_ties.config(text=f"Ties: {self.stats['draws']}")
-        
-        # Update button hover effects
-        for row in self.buttons:
-            for btn in row:
-                if btn['text'] == '':
-                    btn.bind('<Enter>', lambda e, b=btn: self.on_enter(e, b))
-                    btn.bind('<Leave>', lambda e, b=btn: self.on_leave(e, b))
+        self.set_label(self.status_label, f"{player_name}'s Turn ({symbol})")
+        
+    def wait_for(self, future, callback):
+        # Polls a stats store Future so the UI thread never blocks on disk
+        if not future.done():
+            self.after(20, self.wait_for, future, callback)
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            self.report_callback_exception(type(e), e, e.__traceback__)
+            return
+        callback(result)
+
+    def on_totals_loaded(self, totals):
+        for winner in self.pending_results:
+            update_totals(totals, winner)
+        self.pending_results = None
+        self.stats = totals
+        self.set_label(self.score_x, f"X: {self.stats['x_wins']}")
+        self.set_label(self.score_o, f"O: {self.stats['o_wins']}")
+        self.set_label(self.score_ties, f"Ties: {self.stats['draws']}")
+
+    def update_score(self, winner):
+        # Only the counter the result changed is redrawn
+        if winner == 'X':
+            self.set_label(self.score_x, f"X: {self.stats['x_wins']}")
+        elif winner == 'O':
+            self.set_label(self.score_o, f"O: {self.stats['o_wins']}")
+        else:
+            self.set_label(self.score_ties, f"Ties: {self.stats['draws']}")
+
+    def toggle_computer(self):
+        if self.vs_computer.get():
+            self.computer = self.player_o
+            self.start_computer_turn()
+        else:
+            self.computer = None
+            self.ai.cancel()
+            self.update_status()
+        
+    def start_computer_turn(self):
+        # Runs after every move; searches only when it is the computer's turn
+        if (self.computer is None or self.current_player is not self.computer or self.ai.busy
+                or not self.game_active or self.board.state != GameState.RUNNING):
+            return
+        self.set_label(self.status_label, f"{self.computer.getName()} is thinking...")
+        opponent = self.player_x if self.computer is self.player_o else self.player_o
+        self.ai.request(self.board, self.computer, opponent)
+        
+    def on_computer_move(self, cell):
+        # Delivered on the Tk thread by the worker's poll
+        if not self.game_active or self.current_player is not self.computer:
+            return
+        self.redo_moves.clear()
+        self.play(Move.of(cell[0], cell[1], self.computer))
+
+    def on_computer_error(self, error):
+        # The engine failed: leave "thinking..." and hand the game back
+        self.vs_computer.set(False)
+        self.computer = None
+        self.update_status()
+        messagebox.showerror("Computer opponent", f"The computer could not move:\n{error}")
 
     def make_move(self, row: int, col: int) -> None:
-        if not self.game_active or self.board.board_matrix[row][col] != "":
+        if (not self.game_active or self.current_player is self.computer
+                or not self.board.is_free(row, col)):
             return
             
-        # Make the move
-        move = Move(row, col, self.current_player)
-        self.board.update_board(move)
+        self.redo_moves.clear()
+        self.play(Move.of(row, col, self.current_player))
         
-        # Update the button
-        btn = self.buttons[row][col]
-        symbol = self.current_player.getSymbol()
-        btn.config(
-            text=symbol,
-            fg=COLORS['x_color'] if symbol == 'X' else COLORS['o_color'],
-            state='disabled'
-        )
+    def undo_move(self) -> None:
+        # Only moves of the game in progress can be taken back
+        if (not self.game_active or self.board.state != GameState.RUNNING
+                or not self.board.history):
+            return
+        self.ai.cancel()
+        move = self.board.unmake()
+        self.redo_moves.append(move)
+        self.current_player = move.getPlayer()
+        # Against the computer, take back its reply as well
+        if self.current_player is self.computer and self.board.history:
+            move = self.board.unmake()
+            self.redo_moves.append(move)
+            self.current_player = move.getPlayer()
+        self.update_status()
+        self.start_computer_turn()
+        
+    def redo_move(self) -> None:
+        if not self.game_active or not self.redo_moves:
+            return
+        self.ai.cancel()
+        self.play(self.redo_moves.pop())
+        # Against the computer, replay its reply instead of searching again
+        if self.current_player is self.computer and self.redo_moves and self.game_active:
+            self.play(self.redo_moves.pop())
+        
+    def play(self, move: Move) -> None:
+        # Make the move
+        self.current_player = move.getPlayer()
+        self.board.make(move)
         
         # Check game state
         if self.board.state == GameState.WIN:
@@ -306,39 +477,26 @@ class TicTacToeApp(tk.Tk):
         else:
             self.switch_player()
             self.update_status()
+            # Let the board redraw before the computer starts thinking
+            self.after_idle(self.start_computer_turn)
 
-    def highlight_win_line(self) -> None:
-        if not self.board.win_line:
-            return
-            
-        win_buttons = []
-        for r, c in self.board.win_line:
-            btn = self.buttons[r][c]
-            win_buttons.append(btn)
-            
-        # Start smooth win animation
-        self.game_active = True  # Ensure animation runs
-        self.animate_win(win_buttons)
+    def record_result(self, winner):
+        # Update the in-memory totals and queue the game for the stats store
+        update_totals(self.stats, winner)
+        if self.pending_results is not None:
+            self.pending_results.append(winner)
+        self.stats_store.record_game(GameEvent(
+            self.variant,
+            self.player_x.getName(),
+            self.player_o.getName(),
+            winner,
+            self.board.n_moves
+        ))
+        self.update_score(winner)
         
     def handle_win(self):
         # Update stats
-        self.stats['total_games'] += 1
-        winner = self.current_player.getSymbol()
-        
-        if winner == 'X':
-            self.stats['x_wins'] += 1
-            self.stats['win_streak'] = self.stats['win_streak'] + 1 if self.stats['win_streak'] >= 0 else 1
-        else:
-            self.stats['o_wins'] += 1
-            self.stats['win_streak'] = self.stats['win_streak'] - 1 if self.stats['win_streak'] <= 0 else -1
-            
-        self.stats['max_win_streak'] = max(
-            self.stats['max_win_streak'],
-            abs(self.stats['win_streak'])
-        )
-        
-        # Highlight winning line
-        self.highlight_win_line()
+        self.record_result(self.current_player.getSymbol())
         
         # Disable all buttons
         self.game_active = False
@@ -353,8 +511,10 @@ class TicTacToeApp(tk.Tk):
         
     def handle_draw(self):
         # Update stats
-        self.stats['total_games'] += 1
-        self.stats['draws'] += 1
+        self.record_result(None)
+        
+        # The result is recorded, so the game cannot be undone or replayed
+        self.game_active = False
         
         # Show draw message
         messagebox.showinfo(
@@ -366,24 +526,15 @@ class TicTacToeApp(tk.Tk):
     def switch_player(self):
         self.current_player = self.player_o if self.current_player == self.player_x else self.player_x
 
-    def reset_buttons(self) -> None:
-        for row in self.buttons:
-            for btn in row:
-                btn.config(
-                    text="",
-                    bg=COLORS['button_bg'],
-                    fg=COLORS['text'],
-                    state='normal'
-                )
-
     def restart_game(self) -> None:
-        # Stop any running animations
+        # Stop any running animations and computer search
         self.stop_animations()
+        self.ai.cancel()
         
         # Reset game state
         self.game_active = True
         self.board.reset()
-        self.reset_buttons()
+        self.redo_moves.clear()
         
         # Randomize starting player for variety
         if random.choice([True, False]):
@@ -393,12 +544,16 @@ class TicTacToeApp(tk.Tk):
             
         # Update UI
         self.update_status()
+        self.start_computer_turn()
         
     def show_stats(self):
-        win_percentage = (
-            (self.stats['x_wins'] + self.stats['o_wins']) / 
-            max(1, self.stats['total_games']) * 100
-        ) if self.stats['total_games'] > 0 else 0
+        # The recent win rates are read on the stats store's thread
+        players = [self.player_x.getName(), self.player_o.getName()]
+        self.wait_for(self.stats_store.recent_win_rates(players, self.variant, 20), self.show_stats_with)
+
+    def show_stats_with(self, recent):
+        (x_recent, x_rate), (o_recent, o_rate) = recent
+        win_percentage = win_rate(self.stats)
         
         stats_text = (
             f"📊 Game Statistics\n\n"
@@ -409,7 +564,9 @@ class TicTacToeApp(tk.Tk):
             f"Win Rate: {win_percentage:.1f}%\n"
             f"Current Streak: {abs(self.stats['win_streak'])} "
             f"({'X' if self.stats['win_streak'] > 0 else 'O' if self.stats['win_streak'] < 0 else ''})\n"
-            f"Max Win Streak: {self.stats['max_win_streak']}"
+            f"Max Win Streak: {self.stats['max_win_streak']}\n"
+            f"X Win Rate (last {x_recent}): {x_rate:.1f}%\n"
+            f"O Win Rate (last {o_recent}): {o_rate:.1f}%"
         )
         
         messagebox.showinfo("Game Statistics", stats_text)
@@ -417,4 +574,6 @@ class TicTacToeApp(tk.Tk):
     def on_closing(self):
         # Clean up resources
         self.stop_animations()
+        self.ai.cancel()
+        self.stats_store.close()
         self.destroy()
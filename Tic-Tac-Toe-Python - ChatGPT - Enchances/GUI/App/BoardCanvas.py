@@ -0,0 +1,122 @@
+from typing import Callable, List, Optional, Tuple
+import tkinter as tk
+
+# (text, text color, background) of one cell
+CellLook = Tuple[str, str, str]
+
+class BoardCanvas(tk.Canvas):
+    # Draws an n x n board on one Canvas instead of n*n Button widgets.
+    #
+    # Callers describe what a cell should look like with set_cell(); the
+    # change is only recorded and the cell marked dirty. Once per idle
+    # cycle flush() pushes the dirty cells to their two canvas items, so
+    # the cost of a redraw is the number of changed cells, not the board
+    # size. Clicks and hovering are mapped to cells arithmetically.
+    def __init__(self, master, size: int = 3, cell_px: int = 100, gap: int = 4,
+                 font=("Arial", 24), bg: str = "black", cell_bg: str = "white", fg: str = "black",
+                 on_click: Optional[Callable[[int, int], None]] = None,
+                 on_hover: Optional[Callable[[Optional[Tuple[int,int]], Optional[Tuple[int,int]]], None]] = None):
+        side = size * cell_px + gap
+        super().__init__(master, width=side, height=side, bg=bg, highlightthickness=0)
+        self.size = size
+        self.cell_px = cell_px
+        self.gap = gap
+        self.default_look: CellLook = ("", fg, cell_bg)
+        self.on_click = on_click
+        self.on_hover = on_hover
+        self.hover_cell: Optional[Tuple[int,int]] = None
+
+        # What each cell should show, and what is currently drawn
+        self.looks: List[CellLook] = [self.default_look] * (size*size)
+        self.drawn: List[CellLook] = [self.default_look] * (size*size)
+        self.dirty: List[int] = []
+        self.flush_pending = False
+
+        self.rect_ids: List[int] = []
+        self.text_ids: List[int] = []
+        for index in range(size*size):
+            r, c = divmod(index, size)
+            x0 = c*cell_px + gap
+            y0 = r*cell_px + gap
+            x1 = x0 + cell_px - gap
+            y1 = y0 + cell_px - gap
+            self.rect_ids.append(self.create_rectangle(x0, y0, x1, y1, fill=cell_bg, width=0))
+            self.text_ids.append(self.create_text((x0+x1)//2, (y0+y1)//2, text="", fill=fg, font=font))
+
+        self.bind("<Button-1>", self._on_button)
+        self.bind("<Motion>", self._on_motion)
+        self.bind("<Leave>", self._on_leave)
+
+    # -------------------
+    # Cells
+    # -------------------
+
+    def cell_at(self, x: int, y: int) -> Optional[Tuple[int,int]]:
+        r = (y - self.gap // 2) // self.cell_px
+        c = (x - self.gap // 2) // self.cell_px
+        if 0 <= r < self.size and 0 <= c < self.size:
+            return r, c
+        return None
+
+    def get_cell(self, row: int, col: int) -> CellLook:
+        return self.looks[row*self.size + col]
+
+    def set_cell(self, row: int, col: int, text: Optional[str] = None,
+                 fg: Optional[str] = None, bg: Optional[str] = None) -> None:
+        index = row*self.size + col
+        old = self.looks[index]
+        new = (old[0] if text is None else text,
+               old[1] if fg is None else fg,
+               old[2] if bg is None else bg)
+        if new == old:
+            return
+        self.looks[index] = new
+        self.dirty.append(index)
+        if not self.flush_pending:
+            self.flush_pending = True
+            self.after_idle(self.flush)
+
+    def clear_cell(self, row: int, col: int) -> None:
+        text, fg, bg = self.default_look
+        self.set_cell(row, col, text, fg, bg)
+
+    def reset(self) -> None:
+        for index, look in enumerate(self.looks):
+            if look != self.default_look:
+                self.clear_cell(*divmod(index, self.size))
+
+    def flush(self) -> None:
+        self.flush_pending = False
+        for index in self.dirty:
+            look = self.looks[index]
+            drawn = self.drawn[index]
+            if look == drawn:
+                continue
+            if look[2] != drawn[2]:
+                self.itemconfigure(self.rect_ids[index], fill=look[2])
+            if look[:2] != drawn[:2]:
+                self.itemconfigure(self.text_ids[index], text=look[0], fill=look[1])
+            self.drawn[index] = look
+        self.dirty.clear()
+
+    # -------------------
+    # Input
+    # -------------------
+
+    def _on_button(self, event) -> None:
+        cell = self.cell_at(event.x, event.y)
+        if cell is not None and self.on_click is not None:
+            self.on_click(*cell)
+
+    def _on_motion(self, event) -> None:
+        cell = self.cell_at(event.x, event.y)
+        if cell != self.hover_cell:
+            old, self.hover_cell = self.hover_cell, cell
+            if self.on_hover is not None:
+                self.on_hover(old, cell)
+
+    def _on_leave(self, event) -> None:
+        if self.hover_cell is not None:
+            old, self.hover_cell = self.hover_cell, None
+            if self.on_hover is not None:
+                self.on_hover(old, None)
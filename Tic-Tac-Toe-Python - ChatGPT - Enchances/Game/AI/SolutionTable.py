@@ -0,0 +1,132 @@
+import mmap
+import os
+import sys
+import threading
+from typing import Dict, Optional, Tuple
+from ..Board import Board, GameState
+from ..Codec import Codec, line_masks
+from ..Player import Player
+
+# Perfect-play table for the classic 3x3 game.
+#
+# Positions are indexed by their Game/Codec.py code seen from the side to
+# move: digit i (weight 3**i) of cell i is 0 for empty, 1 for the mover's
+# stone and 2 for the opponent's. Each position takes one byte in the file:
+# the high nibble is the game value for the mover (LOSS/DRAW/WIN) and the
+# low nibble the best cell, or NO_MOVE when the game is already over.
+# Codes that cannot come up in play are stored as UNREACHABLE.
+
+SIZE = 3
+N_CELLS = SIZE * SIZE
+CODEC = Codec(SIZE)
+N_CODES = CODEC.n_codes
+
+LOSS = 0
+DRAW = 1
+WIN = 2
+NO_MOVE = 0x0F
+UNREACHABLE = 0xFF
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solutions.bin")
+
+WIN_MASKS = line_masks(SIZE, SIZE)
+
+def has_line(bits: int) -> bool:
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+def position_code(mine: int, theirs: int) -> int:
+    return CODEC.encode_bits(mine, theirs)
+
+def board_code(board: Board, player: Player) -> int:
+    return CODEC.encode(board, player.getSymbol())
+
+def solve() -> bytearray:
+    table = bytearray([UNREACHABLE]) * N_CODES
+    solved: Dict[Tuple[int, int], int] = {}
+
+    def value(mine: int, theirs: int) -> int:
+        # Game value for the side to move; fills in `table` as it goes
+        key = (mine, theirs)
+        if key in solved:
+            return solved[key]
+        if has_line(theirs):
+            result, best_cell = LOSS, NO_MOVE
+        elif mine | theirs == (1 << N_CELLS) - 1:
+            result, best_cell = DRAW, NO_MOVE
+        else:
+            result, best_cell = -1, NO_MOVE
+            for cell in range(N_CELLS):
+                if (mine | theirs) >> cell & 1:
+                    continue
+                # The child is seen from the opponent, so flip the value
+                child = WIN - value(theirs, mine | (1 << cell))
+                if child > result:
+                    result, best_cell = child, cell
+        solved[key] = result
+        table[position_code(mine, theirs)] = (result << 4) | best_cell
+        return result
+
+    value(0, 0)
+    return table
+
+def build(path: str = DEFAULT_PATH) -> int:
+    table = solve()
+    # Pool workers may build the table at the same time; each writes its
+    # own temporary file, and the renames swap in identical tables
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(table)
+    os.replace(tmp_path, path)
+    return sum(1 for entry in table if entry != UNREACHABLE)
+
+class SolutionTable:
+    # Nothing is read until the first lookup; after that every lookup is a
+    # single byte read from the memory-mapped file.
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._data = None
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            try:
+                build(self.path)
+            except OSError:
+                # Read-only install: keep the solved table in memory
+                self._data = bytes(solve())
+                return self._data
+        with open(self.path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) != N_CODES:
+            raise ValueError(f"{self.path} is not a {SIZE}x{SIZE} solution table")
+        return self._data
+
+    def lookup(self, code: int) -> Tuple[int, int]:
+        # (value for the mover, best cell or NO_MOVE)
+        data = self._data if self._data is not None else self._load()
+        entry = data[code]
+        if entry == UNREACHABLE:
+            raise KeyError(f"position {code} cannot occur in play")
+        return entry >> 4, entry & 0x0F
+
+    def value(self, board: Board, player: Player) -> int:
+        return self.lookup(board_code(board, player))[0]
+
+    def best_move(self, board: Board, player: Player, opponent: Optional[Player] = None,
+                  stop: Optional[threading.Event] = None) -> Optional[Tuple[int,int]]:
+        # Same signature as the search engines; a lookup never needs stopping
+        if board.state != GameState.RUNNING:
+            return None
+        if (board.size, board.win_length) != (SIZE, SIZE):
+            raise ValueError("the solution table only covers the classic 3x3 board")
+        cell = self.lookup(board_code(board, player))[1]
+        if cell == NO_MOVE:
+            return None
+        return divmod(cell, SIZE)
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    count = build(target)
+    print(f"wrote {count} positions to {target}")
@@ -0,0 +1,49 @@
+from typing import List, Optional, Tuple
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+class TranspositionTable:
+    # Fixed-size, direct-mapped table: slot = key & mask. A new entry
+    # replaces the old one unless the old one was searched deeper for
+    # a different position.
+    def __init__(self, bits: int = 16):
+        self.size = 1 << bits
+        self.mask = self.size - 1
+        self.keys: List[Optional[int]] = [None] * self.size
+        self.entries: List[Optional[Tuple[int, int, int, int]]] = [None] * self.size
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.used = 0
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        # Returns (depth, value, flag, move) or None
+        self.probes += 1
+        slot = key & self.mask
+        if self.keys[slot] == key:
+            self.hits += 1
+            return self.entries[slot]
+        return None
+
+    def store(self, key: int, depth: int, value: int, flag: int, move: int) -> None:
+        slot = key & self.mask
+        old_key = self.keys[slot]
+        if old_key is None:
+            self.used += 1
+        else:
+            old = self.entries[slot]
+            if old_key != key and old is not None and old[0] > depth:
+                return
+        self.keys[slot] = key
+        self.entries[slot] = (depth, value, flag, move)
+        self.stores += 1
+
+    def clear(self) -> None:
+        self.keys = [None] * self.size
+        self.entries = [None] * self.size
+        self.used = 0
+
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
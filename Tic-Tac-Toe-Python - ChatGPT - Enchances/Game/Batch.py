@@ -0,0 +1,94 @@
+from functools import lru_cache
+from math import isqrt
+from typing import Iterable, Optional, Sequence, Tuple
+import numpy as np
+from .Board import Board, GameState
+
+# Vectorised win/draw evaluation for many positions at once (needs NumPy).
+#
+# Cells are coded EMPTY/X/O. Results use the GameState values for `state`,
+# the cell code of the winner (EMPTY if none) for `winner`, and an index
+# into Board.win_lines(size, win_length) for `line` (NO_LINE if none). For
+# any position reached in play these match what the scalar Board reports:
+# Board.win_lines(...)[line] equals board.win_line[:win_length].
+
+EMPTY = 0
+X = 1
+O = 2
+NO_LINE = -1
+
+@lru_cache(maxsize=None)
+def line_indices(size: int, win_length: int) -> np.ndarray:
+    # (n_lines, win_length) array of flat cell indices, in Board's line order
+    lines = Board.win_lines(size, win_length)
+    table = np.array([[r*size + c for r, c in line] for line in lines], dtype=np.intp)
+    table.setflags(write=False)
+    return table
+
+def encode_boards(boards: Iterable[Board], x_symbol: str = "X", size: int = 3) -> np.ndarray:
+    # (N, size*size) int8 codes for a sequence of same-sized boards; `size`
+    # only gives the width of the result when there are no boards
+    boards = list(boards)
+    if not boards:
+        return np.zeros((0, size*size), dtype=np.int8)
+    n_cells = boards[0].n_cells
+    out = np.zeros((len(boards), n_cells), dtype=np.int8)
+    key = x_symbol.upper()
+    for i, board in enumerate(boards):
+        x_bits = board.bitboards.get(key, 0)
+        o_bits = board.occupied & ~x_bits
+        for cell in range(n_cells):
+            if x_bits >> cell & 1:
+                out[i, cell] = X
+            elif o_bits >> cell & 1:
+                out[i, cell] = O
+    return out
+
+def _flatten(cells) -> Tuple[np.ndarray, int]:
+    cells = np.asarray(cells)
+    if cells.ndim == 3:
+        if cells.shape[1] != cells.shape[2]:
+            raise ValueError(f"expected (N, n, n) boards, got shape {cells.shape}")
+        size = cells.shape[1]
+        return cells.reshape(cells.shape[0], size*size), size
+    if cells.ndim == 2:
+        size = isqrt(cells.shape[1])
+        if size*size != cells.shape[1]:
+            raise ValueError(f"{cells.shape[1]} cells is not a square board")
+        return cells, size
+    raise ValueError(f"expected (N, n*n) or (N, n, n) boards, got shape {cells.shape}")
+
+def evaluate(cells, win_length: Optional[int] = None,
+             chunk_size: int = 1 << 16) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Returns (state, winner, line), each of shape (N,)
+    flat, size = _flatten(cells)
+    k = win_length or size
+    lines = line_indices(size, k)
+    n = flat.shape[0]
+    state = np.empty(n, dtype=np.int8)
+    winner = np.empty(n, dtype=np.int8)
+    line = np.empty(n, dtype=np.int32)
+    # Work in chunks so the (chunk, n_lines, k) gather stays bounded
+    for start in range(0, n, chunk_size):
+        part = flat[start:start + chunk_size]
+        gathered = part[:, lines]
+        x_full = (gathered == X).all(axis=2)
+        o_full = (gathered == O).all(axis=2)
+        x_won = x_full.any(axis=1)
+        o_won = o_full.any(axis=1)
+        won = x_won | o_won
+        full = (part != EMPTY).all(axis=1)
+
+        stop = start + part.shape[0]
+        winner[start:stop] = np.where(x_won, X, np.where(o_won, O, EMPTY))
+        line[start:stop] = np.where(x_won, x_full.argmax(axis=1),
+                                    np.where(o_won, o_full.argmax(axis=1), NO_LINE))
+        state[start:stop] = np.where(won, GameState.WIN.value,
+                                     np.where(full, GameState.DRAW.value, GameState.RUNNING.value))
+    return state, winner, line
+
+def evaluate_boards(boards: Sequence[Board], x_symbol: str = "X") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if not boards:
+        empty = np.zeros(0, dtype=np.int8)
+        return empty, empty, np.zeros(0, dtype=np.int32)
+    return evaluate(encode_boards(boards, x_symbol), boards[0].win_length)
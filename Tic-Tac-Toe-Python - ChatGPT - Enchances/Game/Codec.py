@@ -0,0 +1,218 @@
+from array import array
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from .AI.Zobrist import symmetry_tables
+from .Board import Board
+from .Move import Move
+from .Player import Player
+
+# Compact integer identities for board positions.
+#
+# A position is two bitboards, `first` and `second`; which side is which is
+# up to the caller (X and O, or the side to move and the other one). Boards
+# of up to TERNARY_CELLS cells get a base-3 code: digit i (weight 3**i) is
+# EMPTY, FIRST or SECOND for cell i, so the codes are dense and can index a
+# table directly. Bigger boards use packed bits instead, first | second << n,
+# which needs no arithmetic per cell.
+#
+# canonical() picks the smallest code over the 8 symmetries of the square,
+# so rotated and mirrored positions share one identity. ReachableIndex is a
+# minimal perfect hash: it numbers the positions that can come up in play
+# 0, 1, 2, ... with no gaps. encode_array()/decode_array() do the same
+# coding for NumPy arrays of boards, using the EMPTY/X/O cell codes of
+# Game/Batch.py.
+
+EMPTY = 0
+FIRST = 1
+SECOND = 2
+
+TERNARY_CELLS = 16
+
+# Base-3 value of every byte read as 8 binary digits, so a bitboard is
+# converted a byte at a time
+BYTE_TERNARY = tuple(sum(3**i for i in range(8) if b >> i & 1) for b in range(256))
+
+class Codec:
+    __slots__ = ("size", "n_cells", "ternary", "perms", "_byte_weights")
+
+    def __init__(self, size: int = 3):
+        self.size = size
+        self.n_cells = size * size
+        self.ternary = self.n_cells <= TERNARY_CELLS
+        self.perms, _ = symmetry_tables(size)
+        self._byte_weights = tuple(3**(8*i) for i in range((self.n_cells + 7) // 8))
+
+    @property
+    def n_codes(self) -> int:
+        # Codes run from 0 to n_codes - 1
+        return 3**self.n_cells if self.ternary else 1 << (2*self.n_cells)
+
+    def encode_bits(self, first: int, second: int) -> int:
+        if not self.ternary:
+            return first | second << self.n_cells
+        code = 0
+        for weight in self._byte_weights:
+            code += (BYTE_TERNARY[first & 0xFF] + 2*BYTE_TERNARY[second & 0xFF]) * weight
+            first >>= 8
+            second >>= 8
+        return code
+
+    def decode_bits(self, code: int) -> Tuple[int, int]:
+        if not self.ternary:
+            mask = (1 << self.n_cells) - 1
+            return code & mask, code >> self.n_cells & mask
+        first = second = 0
+        for cell in range(self.n_cells):
+            code, digit = divmod(code, 3)
+            if digit == FIRST:
+                first |= 1 << cell
+            elif digit == SECOND:
+                second |= 1 << cell
+        return first, second
+
+    def encode(self, board: Board, first_symbol: str = "X") -> int:
+        first = board.bitboards.get(first_symbol.upper(), 0)
+        return self.encode_bits(first, board.occupied & ~first)
+
+    def to_board(self, code: int, first: Player, second: Player, win_length: Optional[int] = None) -> Board:
+        # A board holding the decoded stones. If a side has a line, a stone
+        # of that line goes down last so the board reports the win.
+        first_bits, second_bits = self.decode_bits(code)
+        board = Board(self.size, win_length)
+        masks = line_masks(self.size, board.win_length)
+        order = [(first_bits, first), (second_bits, second)]
+        for bits, player in order:
+            line = next((mask for mask in masks if bits & mask == mask), 0)
+            if line:
+                last = line & -line
+                other = [entry for entry in order if entry[1] is not player]
+                order = other + [(bits & ~last, player), (last, player)]
+                break
+        for bits, player in order:
+            while bits:
+                low = bits & -bits
+                bits ^= low
+                r, c = divmod(low.bit_length() - 1, self.size)
+                board.make(Move.of(r, c, player))
+        return board
+
+    def transform(self, bits: int, sym: int) -> int:
+        perm = self.perms[sym]
+        out = 0
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            out |= 1 << perm[low.bit_length() - 1]
+        return out
+
+    def canonical_bits(self, first: int, second: int) -> Tuple[int, int]:
+        # (smallest code over the symmetries, the symmetry that gives it)
+        best, best_sym = -1, 0
+        for sym in range(len(self.perms)):
+            code = self.encode_bits(self.transform(first, sym), self.transform(second, sym))
+            if best < 0 or code < best:
+                best, best_sym = code, sym
+        return best, best_sym
+
+    def canonical(self, board: Board, first_symbol: str = "X") -> int:
+        first = board.bitboards.get(first_symbol.upper(), 0)
+        return self.canonical_bits(first, board.occupied & ~first)[0]
+
+@lru_cache(maxsize=None)
+def line_masks(size: int, win_length: int) -> Tuple[int, ...]:
+    return tuple(sum(1 << (r*size + c) for r, c in line) for line in Board.win_lines(size, win_length))
+
+# -------------------
+# Perfect hash
+# -------------------
+
+class ReachableIndex:
+    # Numbers every position that can come up in play, X first, as
+    # 0 .. len - 1 in code order (only the symmetry-canonical ones with
+    # canonical=True). rank() is one array read into a dense table over all
+    # codes, so it is meant for boards with a small code space such as 3x3.
+    def __init__(self, size: int = 3, win_length: Optional[int] = None, canonical: bool = False):
+        self.codec = Codec(size)
+        if not self.codec.ternary:
+            raise ValueError(f"a {size}x{size} board has too many codes for a dense index")
+        self.canonical = canonical
+        self.codes = array("q", sorted(reachable_codes(self.codec, win_length or size, canonical)))
+        self.ranks = array("i", [-1]) * self.codec.n_codes
+        for rank, code in enumerate(self.codes):
+            self.ranks[code] = rank
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def rank(self, code: int) -> int:
+        # Raises KeyError for codes that cannot come up in play
+        if self.canonical:
+            code = self.codec.canonical_bits(*self.codec.decode_bits(code))[0]
+        rank = self.ranks[code]
+        if rank < 0:
+            raise KeyError(f"position {code} cannot occur in play")
+        return rank
+
+    def unrank(self, rank: int) -> int:
+        return self.codes[rank]
+
+    def rank_board(self, board: Board, x_symbol: str = "X") -> int:
+        return self.rank(self.codec.encode(board, x_symbol))
+
+def reachable_codes(codec: Codec, win_length: int, canonical: bool = False) -> List[int]:
+    # Codes (X = FIRST) of every position reachable from the empty board;
+    # finished positions are included but not played on
+    masks = line_masks(codec.size, win_length)
+    full = (1 << codec.n_cells) - 1
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        x, o = stack.pop()
+        if (x, o) in seen:
+            continue
+        seen.add((x, o))
+        if any(x & m == m or o & m == m for m in masks) or x | o == full:
+            continue
+        x_to_move = bin(x).count("1") == bin(o).count("1")
+        free = full & ~(x | o)
+        while free:
+            low = free & -free
+            free ^= low
+            stack.append((x | low, o) if x_to_move else (x, o | low))
+    if canonical:
+        return list({codec.canonical_bits(x, o)[0] for x, o in seen})
+    return [codec.encode_bits(x, o) for x, o in seen]
+
+# -------------------
+# NumPy batches
+# -------------------
+
+def encode_array(cells, size: Optional[int] = None):
+    # (N,) int64 codes for (N, n*n) or (N, n, n) arrays of EMPTY/X/O cells,
+    # matching Codec.encode(board, "X"). Packed codes need 2*n*n <= 63.
+    import numpy as np
+    cells = np.asarray(cells)
+    flat = cells.reshape(cells.shape[0], -1).astype(np.int64)
+    codec = Codec(size or int(round(flat.shape[1] ** 0.5)))
+    if codec.n_cells != flat.shape[1]:
+        raise ValueError(f"{flat.shape[1]} cells is not a {codec.size}x{codec.size} board")
+    if codec.ternary:
+        return flat @ (3 ** np.arange(codec.n_cells, dtype=np.int64))
+    if 2*codec.n_cells > 63:
+        raise ValueError(f"{codec.size}x{codec.size} codes do not fit in 64 bits")
+    weights = np.int64(1) << np.arange(codec.n_cells, dtype=np.int64)
+    return ((flat == FIRST) @ weights) | (((flat == SECOND) @ weights) << codec.n_cells)
+
+def decode_array(codes, size: int = 3):
+    # Inverse of encode_array: (N, size*size) int8 cells
+    import numpy as np
+    codes = np.asarray(codes, dtype=np.int64)
+    codec = Codec(size)
+    shifts = np.arange(codec.n_cells, dtype=np.int64)
+    if codec.ternary:
+        return (codes[:, None] // 3 ** shifts % 3).astype(np.int8)
+    if 2*codec.n_cells > 63:
+        raise ValueError(f"{codec.size}x{codec.size} codes do not fit in 64 bits")
+    first = codes[:, None] >> shifts & 1
+    second = codes[:, None] >> (shifts + codec.n_cells) & 1
+    return (first * FIRST + second * SECOND).astype(np.int8)
@@ -0,0 +1,243 @@
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Opt-in instrumentation: latency histograms and counters.
+#
+# Nothing in the engine or the GUI calls into this module. enable() wraps
+# the methods listed in TARGETS with timing wrappers and disable() puts the
+# originals back, so when instrumentation is off the code runs exactly as
+# written and costs nothing. Only modules that are already imported are
+# patched; call enable() again after importing more of them.
+#
+# Snapshots can be written as JSON or in the Prometheus text format, to a
+# file or from a small HTTP endpoint (/metrics and /metrics.json).
+
+PREFIX = "tictactoe"
+
+# Bucket upper bounds in seconds: 1 us doubling up to about 8 s
+BUCKETS: Tuple[float, ...] = tuple(1e-6 * 2**i for i in range(24))
+
+class Histogram:
+    __slots__ = ("name", "counts", "count", "total", "lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        i = bisect_left(BUCKETS, seconds)
+        with self.lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        # Upper bound of the bucket holding the q-th observation
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= rank and seen:
+                return bound
+        return float("inf") if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, object]:
+        cumulative = 0
+        buckets = []
+        for bound, n in zip(BUCKETS, self.counts):
+            cumulative += n
+            buckets.append([bound, cumulative])
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+class Counter:
+    __slots__ = ("name", "value", "lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def add(self, amount: int = 1) -> None:
+        with self.lock:
+            self.value += amount
+
+class Registry:
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, Counter] = {}
+
+    def histogram(self, name: str) -> Histogram:
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = Histogram(name)
+        return hist
+
+    def counter(self, name: str) -> Counter:
+        counter = self.counters.get(name)
+        if counter is None:
+            counter = self.counters[name] = Counter(name)
+        return counter
+
+    def reset(self) -> None:
+        self.histograms.clear()
+        self.counters.clear()
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "timestamp": time.time(),
+            "histograms": {name: h.as_dict() for name, h in sorted(self.histograms.items())},
+            "counters": {name: c.value for name, c in sorted(self.counters.items())},
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        lines = []
+        for name, hist in sorted(self.histograms.items()):
+            metric = f"{PREFIX}_{name.replace('.', '_')}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(BUCKETS, hist.counts):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {hist.count}')
+            lines.append(f"{metric}_sum {hist.total:.9g}")
+            lines.append(f"{metric}_count {hist.count}")
+        for name, counter in sorted(self.counters.items()):
+            metric = f"{PREFIX}_{name.replace('.', '_')}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {counter.value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, fmt: Optional[str] = None) -> None:
+        # Format from the extension unless given: .prom/.txt is Prometheus,
+        # anything else JSON. Written atomically so scrapers never see half.
+        if fmt is None:
+            fmt = "prometheus" if path.endswith((".prom", ".txt")) else "json"
+        text = self.to_prometheus() if fmt == "prometheus" else self.to_json()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/metrics":
+                    body, kind = registry.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, kind = registry.to_json(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+METRICS = Registry()
+
+# -------------------
+# Instrumentation
+# -------------------
+
+def count_search(engine, registry: Registry) -> None:
+    # Counters from the engine's stats after a search
+    stats = engine.stats
+    for field, name in (("nodes", "ai.positions"), ("playouts", "ai.playouts"),
+                        ("tt_probes", "ai.tt_probes"), ("tt_hits", "ai.tt_hits")):
+        value = getattr(stats, field, 0)
+        if value:
+            registry.counter(name).add(value)
+
+# (module, class, method, histogram, hook run after each call with self)
+TARGETS: List[Tuple[str, str, str, str, Optional[Callable]]] = [
+    ("Game.Board", "Board", "update_board", "board.move", None),
+    ("Game.Board", "Board", "is_win", "board.win_check", None),
+    ("Game.AI.Search", "AlphaBeta", "best_move", "ai.search", count_search),
+    ("Game.AI.Search", "Minimax", "best_move", "ai.search", count_search),
+    ("Game.AI.MCTS", "MCTS", "best_move", "ai.search", count_search),
+    # A table lookup keeps no search stats to count
+    ("Game.AI.SolutionTable", "SolutionTable", "best_move", "ai.search", None),
+    # play() applies clicks, computer replies and redos alike
+    ("GUI.App.App", "TicTacToeApp", "play", "gui.move", None),
+    ("GUI.App.BoardCanvas", "BoardCanvas", "flush", "gui.redraw", None),
+    ("Server.GameServer", "GameServer", "dispatch", "server.request", None),
+]
+
+# (class, method) -> original function, for everything currently patched
+_patched: Dict[Tuple[type, str], Callable] = {}
+
+def timed(fn: Callable, hist: Histogram, hook: Optional[Callable], registry: Registry) -> Callable:
+    clock = time.perf_counter
+
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        start = clock()
+        try:
+            return fn(self, *args, **kwargs)
+        finally:
+            hist.observe(clock() - start)
+            if hook is not None:
+                hook(self, registry)
+    return wrapper
+
+def enable(registry: Registry = METRICS) -> List[str]:
+    # Returns the names of the methods patched by this call
+    patched = []
+    for module_name, class_name, method, hist_name, hook in TARGETS:
+        module = sys.modules.get(module_name)
+        cls = getattr(module, class_name, None) if module is not None else None
+        if cls is None or (cls, method) in _patched:
+            continue
+        original = cls.__dict__[method]
+        _patched[(cls, method)] = original
+        setattr(cls, method, timed(original, registry.histogram(hist_name), hook, registry))
+        patched.append(f"{class_name}.{method}")
+    return patched
+
+def disable() -> None:
+    for (cls, method), original in _patched.items():
+        setattr(cls, method, original)
+    _patched.clear()
+
+def is_enabled() -> bool:
+    return bool(_patched)
+
+def import_targets() -> None:
+    # Imports the Game modules that have targets, so enable() covers them;
+    # the GUI and server are left alone so they are only loaded when used
+    for module_name in sorted({target[0] for target in TARGETS}):
+        if module_name.startswith("Game."):
+            importlib.import_module(module_name)
@@ -0,0 +1,58 @@
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+from .Board import Board
+from .Player import Player
+
+# A strategy picks the next cell for `player` on a running board
+Strategy = Callable[[Board, Player], Optional[Tuple[int,int]]]
+
+def free_cells(board: Board) -> List[Tuple[int,int]]:
+    n = board.size
+    return [divmod(cell, n) for cell in board.empty_cells()]
+
+def random_strategy(rng: random.Random, size: int = 3, win_length: Optional[int] = None) -> Strategy:
+    def choose(board: Board, player: Player) -> Optional[Tuple[int,int]]:
+        return board.random_empty(rng)
+    return choose
+
+def perfect_strategy(rng: random.Random, size: int = 3, win_length: Optional[int] = None) -> Strategy:
+    from .AI.SolutionTable import SolutionTable
+    if (size, win_length or size) != (3, 3):
+        raise ValueError("the perfect strategy only plays the classic 3x3 board")
+    return SolutionTable().best_move
+
+def alphabeta_strategy(rng: random.Random, size: int = 3, win_length: Optional[int] = None) -> Strategy:
+    from .AI.Search import AlphaBeta
+    # Exhaustive on 3x3, a shallow search on anything bigger
+    return AlphaBeta(size, win_length, max_depth=None if size <= 3 else 4).best_move
+
+def mcts_strategy(rng: random.Random, size: int = 3, win_length: Optional[int] = None) -> Strategy:
+    from .AI.MCTS import MCTS
+    # A fixed playout budget keeps games reproducible for a given seed.
+    # The engine draws its seeds from `rng`, so a caller that keeps the
+    # strategy and reseeds `rng` replays the same games.
+    engine = MCTS(size, win_length, playouts=2000)
+    engine.rng = rng
+    return engine.best_move
+
+def learned_strategy(rng: random.Random, size: int = 3, win_length: Optional[int] = None) -> Strategy:
+    from .AI.Learner import Learner
+    if (size, win_length or size) != (3, 3):
+        raise ValueError("the learned strategy only plays the classic 3x3 board")
+    # Trained by self-play on first use, then loaded from its checkpoint
+    return Learner.load_or_train(seed=rng.getrandbits(64)).best_move
+
+# Factories by name, so worker processes can build their own instances
+STRATEGIES: Dict[str, Callable[..., Strategy]] = {
+    "random": random_strategy,
+    "perfect": perfect_strategy,
+    "alphabeta": alphabeta_strategy,
+    "mcts": mcts_strategy,
+    "learned": learned_strategy,
+}
+
+def make_strategy(name: str, rng: Optional[random.Random] = None,
+                  size: int = 3, win_length: Optional[int] = None) -> Strategy:
+    if name not in STRATEGIES:
+        raise ValueError(f"unknown strategy {name!r}, expected one of {sorted(STRATEGIES)}")
+    return STRATEGIES[name](rng or random.Random(), size, win_length)
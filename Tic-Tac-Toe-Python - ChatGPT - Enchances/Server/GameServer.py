@@ -0,0 +1,203 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional, Tuple
+from Game.Record import RecordWriter
+from .Session import Session, SessionError
+
+# Line-delimited JSON over TCP. Each request is one object with an "op":
+#
+#   {"op": "create", "name": "...", "size": 3, "win_length": 3}
+#   {"op": "join", "session": 1, "name": "..."}
+#   {"op": "move", "session": 1, "token": "...", "row": 0, "col": 2}
+#   {"op": "state", "session": 1}
+#   {"op": "resign", "session": 1, "token": "..."}
+#
+# Each reply is one object with "ok" and, on failure, "error". An "id"
+# field in the request is echoed back so clients can pipeline requests.
+#
+# With a record_dir, every finished game is archived to one record file per
+# board geometry (see Game/Record.py).
+
+MAX_LINE = 4096
+MAX_SIZE = 19
+
+log = logging.getLogger(__name__)
+
+class GameServer:
+    def __init__(self, idle_timeout: float = 300.0, sweep_interval: float = 30.0,
+                 record_dir: Optional[str] = None):
+        self.sessions: Dict[int, Session] = {}
+        self.record_dir = record_dir
+        if record_dir is not None:
+            os.makedirs(record_dir, exist_ok=True)
+        self.recorders: Dict[Tuple[int, int], RecordWriter] = {}
+        self.next_id = 1
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self.moves = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sweeper: Optional[asyncio.Task] = None
+
+    # -------------------
+    # Requests
+    # -------------------
+
+    def int_field(self, request: Dict[str, object], name: str, default: Optional[int] = None) -> int:
+        # JSON integers only: int() would accept 2.5 and raise OverflowError on 1e999
+        value = request.get(name, default)
+        if value is None:
+            raise KeyError(name)
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise SessionError(f"{name} must be an integer")
+        return value
+
+    def get_session(self, request: Dict[str, object]) -> Session:
+        session = self.sessions.get(request.get("session"))
+        if session is None:
+            raise SessionError("unknown session")
+        session.touch()
+        return session
+
+    def op_create(self, request: Dict[str, object]) -> Dict[str, object]:
+        size = self.int_field(request, "size", 3)
+        win_length = self.int_field(request, "win_length", size)
+        if not 1 <= size <= MAX_SIZE:
+            raise SessionError(f"size must be between 1 and {MAX_SIZE}")
+        try:
+            session = Session(self.next_id, size, win_length)
+        except ValueError as e:
+            raise SessionError(str(e)) from None
+        self.next_id += 1
+        self.sessions[session.id] = session
+        player, token = session.add_player(str(request.get("name", "Player X")))
+        return {"session": session.id, "symbol": player.getSymbol(), "token": token}
+
+    def op_join(self, request: Dict[str, object]) -> Dict[str, object]:
+        session = self.get_session(request)
+        player, token = session.add_player(str(request.get("name", "Player O")))
+        return {"session": session.id, "symbol": player.getSymbol(), "token": token}
+
+    def op_move(self, request: Dict[str, object]) -> Dict[str, object]:
+        session = self.get_session(request)
+        session.move(str(request.get("token")), self.int_field(request, "row"),
+                     self.int_field(request, "col"))
+        self.moves += 1
+        if session.is_over():
+            self.archive(session)
+        return session.snapshot()
+
+    def op_state(self, request: Dict[str, object]) -> Dict[str, object]:
+        return self.get_session(request).snapshot()
+
+    def op_resign(self, request: Dict[str, object]) -> Dict[str, object]:
+        session = self.get_session(request)
+        session.resign(str(request.get("token")))
+        self.archive(session)
+        return session.snapshot()
+
+    def dispatch(self, line: bytes) -> Dict[str, object]:
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise SessionError("request must be a JSON object")
+            request_id = request.get("id")
+            handler = getattr(self, f"op_{request.get('op')}", None)
+            if handler is None:
+                raise SessionError(f"unknown op {request.get('op')!r}")
+            reply = handler(request)
+            reply["ok"] = True
+        except (SessionError, KeyError, TypeError, ValueError) as e:
+            message = f"missing field {e}" if isinstance(e, KeyError) else str(e)
+            reply = {"ok": False, "error": message}
+        if request_id is not None:
+            reply["id"] = request_id
+        return reply
+
+    def archive(self, session: Session) -> None:
+        if self.record_dir is None:
+            return
+        board = session.board
+        key = (board.size, board.win_length)
+        # The game is already over when it is archived, so a failure here
+        # is logged and the player still gets the reply
+        try:
+            writer = self.recorders.get(key)
+            if writer is None:
+                path = os.path.join(self.record_dir, f"games-{board.size}x{board.size}k{board.win_length}.ttr")
+                writer = self.recorders[key] = RecordWriter(path, board.size, board.win_length)
+            cells, first, result = session.record()
+            writer.append(cells, first, result)
+        except (OSError, ValueError):
+            log.exception("could not archive session %d", session.id)
+
+    def flush_records(self) -> None:
+        for writer in self.recorders.values():
+            writer.flush()
+
+    # -------------------
+    # Connections
+    # -------------------
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b'{"ok": false, "error": "line too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                reply = self.dispatch(line)
+                writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+                # Only wait for the socket when its buffer is backing up
+                if writer.transport.get_write_buffer_size() > 64 * 1024:
+                    await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def sweep(self) -> int:
+        # Drop sessions nobody has touched within idle_timeout
+        cutoff = time.monotonic() - self.idle_timeout
+        stale = [sid for sid, session in self.sessions.items() if session.last_active < cutoff]
+        for sid in stale:
+            del self.sessions[sid]
+        return len(stale)
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.sweep()
+            self.flush_records()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+        self._sweeper = asyncio.ensure_future(self._sweep_forever())
+        return self._server
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in self.recorders.values():
+            writer.close()
+        self.recorders.clear()
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List, Optional
+from .GameServer import GameServer
+
+# Load generator for GameServer: each connection creates a session, joins
+# it as the second player too, and plays random moves game after game.
+# Reports moves per second and request latency percentiles.
+
+class Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 latencies: List[float]):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+
+    async def call(self, request: dict) -> dict:
+        start = time.perf_counter()
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        line = await self.reader.readline()
+        self.latencies.append(time.perf_counter() - start)
+        if not line:
+            raise ConnectionError("server closed the connection")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise RuntimeError(f"{request['op']} failed: {reply.get('error')}")
+        return reply
+
+async def play(host: str, port: int, games: int, size: int, latencies: List[float],
+               rng: random.Random) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    conn = Connection(reader, writer, latencies)
+    moves = 0
+    try:
+        for _ in range(games):
+            created = await conn.call({"op": "create", "size": size})
+            session = created["session"]
+            joined = await conn.call({"op": "join", "session": session})
+            tokens = {"X": created["token"], "O": joined["token"]}
+            state = await conn.call({"op": "state", "session": session})
+            while state["state"] == "RUNNING":
+                free = [i for i, sym in enumerate(state["cells"]) if sym == "."]
+                row, col = divmod(rng.choice(free), size)
+                state = await conn.call({"op": "move", "session": session,
+                                         "token": tokens[state["turn"]], "row": row, "col": col})
+                moves += 1
+    finally:
+        writer.close()
+    return moves
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+async def run(host: str, port: int, connections: int, games: int, size: int,
+              local: bool, seed: int) -> None:
+    server = None
+    if local:
+        server = GameServer()
+        await server.start(host, port)
+    latencies: List[float] = []
+    try:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            play(host, port, games, size, latencies, random.Random(seed + i))
+            for i in range(connections)
+        ))
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            await server.stop()
+
+    moves = sum(results)
+    latencies.sort()
+    print(f"{connections} connections x {games} games: {moves} moves in {elapsed:.2f}s")
+    print(f"moves/s: {moves / elapsed:,.0f}   requests/s: {len(latencies) / elapsed:,.0f}")
+    print("latency ms: " + "  ".join(
+        f"p{q * 100:g}={percentile(latencies, q) * 1000:.2f}" for q in (0.5, 0.9, 0.99, 0.999)
+    ))
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load generator for the game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--games", type=int, default=20, help="games per connection")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--local", action="store_true",
+                        help="start a server in this process instead of connecting to one")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.host, args.port, args.connections, args.games, args.size,
+                    args.local, args.seed))
+
+if __name__ == "__main__":
+    main()
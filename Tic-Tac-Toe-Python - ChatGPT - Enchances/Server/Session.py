@@ -0,0 +1,105 @@
+import secrets
+import time
+from typing import Dict, List, Optional, Tuple
+from Game.Board import Board, GameState
+from Game.Move import Move
+from Game.Player import Player
+from Game.Record import X_WIN, O_WIN, board_record
+
+class SessionError(Exception):
+    pass
+
+class Session:
+    # One hosted game. Slotted so a process can hold tens of thousands.
+    __slots__ = ("id", "board", "players", "tokens", "turn", "winner", "resigned", "last_active")
+
+    def __init__(self, session_id: int, size: int = 3, win_length: Optional[int] = None):
+        self.id = session_id
+        self.board = Board(size, win_length)
+        self.players: List[Player] = []
+        # tokens[i] authorises moves for players[i]
+        self.tokens: List[str] = []
+        self.turn = 0
+        self.winner: Optional[int] = None
+        self.resigned = False
+        self.last_active = time.monotonic()
+
+    def touch(self) -> None:
+        self.last_active = time.monotonic()
+
+    def add_player(self, name: str) -> Tuple[Player, str]:
+        if len(self.players) == 2:
+            raise SessionError("session is full")
+        player = Player("X" if not self.players else "O", name)
+        token = secrets.token_hex(8)
+        self.players.append(player)
+        self.tokens.append(token)
+        return player, token
+
+    def seat(self, token: str) -> int:
+        try:
+            return self.tokens.index(token)
+        except ValueError:
+            raise SessionError("invalid token") from None
+
+    def is_over(self) -> bool:
+        return self.resigned or self.board.state != GameState.RUNNING
+
+    def move(self, token: str, row: int, col: int) -> None:
+        seat = self.seat(token)
+        if len(self.players) < 2:
+            raise SessionError("waiting for an opponent")
+        if self.is_over():
+            raise SessionError("game is over")
+        if seat != self.turn:
+            raise SessionError("not your turn")
+        board = self.board
+        if not (0 <= row < board.size and 0 <= col < board.size):
+            raise SessionError("cell out of range")
+        if board.occupied >> (row*board.size + col) & 1:
+            raise SessionError("cell is taken")
+        board.make(Move.of(row, col, self.players[seat]))
+        if board.state == GameState.WIN:
+            self.winner = seat
+        elif board.state == GameState.RUNNING:
+            self.turn ^= 1
+
+    def resign(self, token: str) -> None:
+        seat = self.seat(token)
+        # Nobody to win yet; the creator can simply leave the session
+        if len(self.players) < 2:
+            raise SessionError("waiting for an opponent")
+        if self.is_over():
+            raise SessionError("game is over")
+        self.resigned = True
+        self.winner = seat ^ 1
+
+    def record(self) -> Tuple[List[int], int, int]:
+        # (cells, first, result) for the game archive; X always starts
+        cells, first, result = board_record(self.board)
+        if self.resigned:
+            result = X_WIN if self.winner == 0 else O_WIN
+        return cells, first, result
+
+    def cells(self) -> str:
+        # Row-major board, '.' for empty cells
+        board = self.board
+        return "".join(sym or "." for row in board.board_matrix for sym in row)
+
+    def snapshot(self) -> Dict[str, object]:
+        board = self.board
+        if self.resigned:
+            state = "RESIGNED"
+        else:
+            state = board.state.name
+        return {
+            "session": self.id,
+            "size": board.size,
+            "win_length": board.win_length,
+            "cells": self.cells(),
+            "players": [p.getName() for p in self.players],
+            "state": state,
+            "turn": None if self.is_over() else ("X", "O")[self.turn],
+            "winner": None if self.winner is None else self.players[self.winner].getSymbol(),
+            "win_line": board.win_line,
+        }
@@ -0,0 +1,224 @@
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+from Game.Board import Board, GameState
+from Game.Move import Move
+from Game.Player import Player
+
+# Benchmarks for the Game package hot paths. Results are written as JSON;
+# pass --compare with an earlier results file to fail on slowdowns.
+#
+# Every result records its unit and whether lower or higher is better.
+# Timings are the best of several repeats, which is the most stable
+# figure on a busy machine.
+
+Results = Dict[str, Dict[str, object]]
+
+PLAYER_X = Player("X", "Player X")
+PLAYER_O = Player("O", "Player O")
+
+def best_time(fn: Callable[[], object], number: int, repeat: int) -> float:
+    # Seconds per call, best of `repeat` runs of `number` calls
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+def random_games(count: int, size: int, win_length: int, seed: int = 1) -> List[List[Move]]:
+    # Pre-generated move lists, so the benchmarks time only the Board
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        board = Board(size, win_length)
+        cells = [(r, c) for r in range(size) for c in range(size)]
+        rng.shuffle(cells)
+        moves = []
+        for i, (r, c) in enumerate(cells):
+            move = Move.of(r, c, PLAYER_X if i % 2 == 0 else PLAYER_O)
+            board.update_board(move)
+            moves.append(move)
+            if board.state != GameState.RUNNING:
+                break
+        games.append(moves)
+    return games
+
+def record(results: Results, name: str, value: float, unit: str, better: str = "lower") -> None:
+    results[name] = {"value": value, "unit": unit, "better": better}
+
+def bench_board(results: Results, size: int, win_length: int, repeat: int) -> None:
+    tag = f"{size}x{size}k{win_length}"
+    games = random_games(200, size, win_length)
+    n_moves = sum(len(g) for g in games)
+    board = Board(size, win_length)
+
+    def play_all():
+        for moves in games:
+            board.reset()
+            for move in moves:
+                board.update_board(move)
+
+    per_run = best_time(play_all, 1, repeat)
+    record(results, f"board.{tag}.update_board", per_run / n_moves * 1e9, "ns/move")
+    record(results, f"board.{tag}.games_per_second", len(games) / per_run, "games/s", "higher")
+
+    # is_win / is_draw on a mid-game position
+    board.reset()
+    for move in games[0][:max(1, len(games[0]) - 1)]:
+        board.update_board(move)
+    record(results, f"board.{tag}.is_win",
+           best_time(lambda: board.is_win(PLAYER_X), 20000, repeat) * 1e9, "ns/call")
+    record(results, f"board.{tag}.is_draw",
+           best_time(board.is_draw, 20000, repeat) * 1e9, "ns/call")
+    record(results, f"board.{tag}.reset",
+           best_time(board.reset, 20000, repeat) * 1e9, "ns/call")
+
+    # Memory held by one live board after a full game
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    live = []
+    for moves in games[:100]:
+        b = Board(size, win_length)
+        for move in moves:
+            b.update_board(move)
+        live.append(b)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    record(results, f"board.{tag}.bytes_per_board", total / len(live), "bytes")
+
+def bench_objects(results: Results, repeat: int) -> None:
+    record(results, "objects.move_create",
+           best_time(lambda: Move(1, 1, PLAYER_X), 50000, repeat) * 1e9, "ns/call")
+    record(results, "objects.move_flyweight",
+           best_time(lambda: Move.of(1, 1, PLAYER_X), 50000, repeat) * 1e9, "ns/call")
+    record(results, "objects.player_create",
+           best_time(lambda: Player("X", "Player X"), 50000, repeat) * 1e9, "ns/call")
+
+def bench_ai(results: Results, repeat: int) -> None:
+    from Game.AI.MCTS import MCTS
+    from Game.AI.Search import AlphaBeta
+    from Game.AI.SolutionTable import SolutionTable
+
+    empty = Board()
+    engine = AlphaBeta()
+    # A fresh engine each run, so the table starts cold
+    def cold_search():
+        nonlocal engine
+        engine = AlphaBeta()
+        engine.best_move(empty, PLAYER_X)
+    record(results, "ai.alphabeta.empty_3x3", best_time(cold_search, 1, repeat) * 1e3, "ms")
+    record(results, "ai.alphabeta.nodes_per_second", engine.stats.nps(), "nodes/s", "higher")
+
+    table = SolutionTable()
+    table.best_move(empty, PLAYER_X)
+    record(results, "ai.solution_table.lookup",
+           best_time(lambda: table.best_move(empty, PLAYER_X), 20000, repeat) * 1e9, "ns/call")
+
+    mcts = MCTS(9, 5, playouts=2000, seed=1)
+    best_time(lambda: mcts.best_move(Board(9, 5), PLAYER_X), 1, repeat)
+    record(results, "ai.mcts.playouts_per_second_9x9", mcts.stats.pps(), "playouts/s", "higher")
+    record(results, "ai.mcts.tree_bytes_9x9", mcts.stats.tree_bytes, "bytes")
+
+def bench_perft(results: Results, repeat: int) -> None:
+    from perft import perft, position
+
+    # Six plies of the 3x3 tree: every make/unmake and win check, no cache
+    board, mover, other = position(3, 3, [])
+    nodes = sum(perft(board, mover, other, 6)[0::3])
+    per_run = best_time(lambda: perft(board, mover, other, 6), 1, repeat)
+    record(results, "board.perft_3x3_nodes_per_second", nodes / per_run, "nodes/s", "higher")
+
+def bench_batch(results: Results, repeat: int) -> None:
+    try:
+        import numpy as np
+        from Game.Batch import evaluate
+    except ImportError:
+        return
+    cells = np.random.default_rng(1).integers(0, 3, size=(100000, 9), dtype=np.int8)
+    per_run = best_time(lambda: evaluate(cells), 1, repeat)
+    record(results, "batch.evaluate_3x3", len(cells) / per_run, "boards/s", "higher")
+
+    from Game.AI.Learner import Learner
+    learner = Learner(seed=1)
+    per_run = best_time(lambda: learner.train(20_000), 1, repeat)
+    record(results, "ai.learner.games_per_second", 20_000 / per_run, "games/s", "higher")
+
+def run(repeat: int, quick: bool) -> Results:
+    results: Results = {}
+    bench_board(results, 3, 3, repeat)
+    if not quick:
+        bench_board(results, 15, 5, repeat)
+    bench_objects(results, repeat)
+    bench_ai(results, repeat)
+    bench_perft(results, repeat)
+    bench_batch(results, repeat)
+    return results
+
+def compare(current: Results, baseline: Results, threshold: float) -> List[str]:
+    # Names of results that got worse by more than `threshold` (a fraction)
+    regressions = []
+    for name, result in current.items():
+        old = baseline.get(name)
+        if not old or not old["value"]:
+            continue
+        change = (result["value"] - old["value"]) / old["value"]
+        if result["better"] == "higher":
+            change = -change
+        if change > threshold:
+            regressions.append(f"{name}: {old['value']:.4g} -> {result['value']:.4g} "
+                               f"{result['unit']} ({change:+.1%} worse)")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Game package")
+    parser.add_argument("--output", "-o", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown as a fraction (default 0.10)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="skip the large-board benchmarks")
+    args = parser.parse_args(argv)
+
+    # Read the baseline before anything is written: with the default paths,
+    # --compare usually names the file this run is about to replace
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    results = run(args.repeat, args.quick)
+    for name, result in results.items():
+        print(f"{name:40} {result['value']:>14,.1f} {result['unit']}")
+
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\nNo regressions over {args.threshold:.0%} against {args.compare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
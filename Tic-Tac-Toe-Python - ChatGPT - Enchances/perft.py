@@ -0,0 +1,218 @@
+
+import argparse
+import multiprocessing as mp
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from Game.Board import Board, GameState
+from Game.Move import Move
+from Game.Player import Player
+
+# Perft: walks the whole game tree from a position down to a given depth
+# and counts what it finds at every ply, through the same Board.make() /
+# Board.unmake() path the game and the engines use. Wrong counts point at
+# a bug in move generation or win detection; a drop in nodes/s at a
+# slowdown.
+#
+# Counts are kept as one flat list, three entries per ply below the root:
+# nodes reached, wins and draws. Terminal positions are wins + draws; from
+# the empty board every complete game ends in exactly one of them.
+#
+# With --cache, subtree counts are reused for positions reached through
+# different move orders. With --workers, the tree is cut at --split-depth
+# and the subtrees are counted in a process pool.
+
+NODES = 0
+WINS = 1
+DRAWS = 2
+FIELDS = 3
+
+# Known counts for the classic board from the empty position:
+# ply -> (nodes, wins, draws); 255,168 complete games in total
+REFERENCE_3X3: Dict[int, Tuple[int, int, int]] = {
+    1: (9, 0, 0),
+    2: (72, 0, 0),
+    3: (504, 0, 0),
+    4: (3024, 0, 0),
+    5: (15120, 1440, 0),
+    6: (54720, 5328, 0),
+    7: (148176, 47952, 0),
+    8: (200448, 72576, 0),
+    9: (127872, 81792, 46080),
+}
+
+# Subtree counts by (mover's stones, all stones, depth left); the moves
+# that led to a running position do not change what lies below it
+Cache = Dict[Tuple[int, int, int], Tuple[int, ...]]
+
+def perft(board: Board, mover: Player, other: Player, depth: int,
+          cache: Optional[Cache] = None) -> List[int]:
+    key = None
+    if cache is not None:
+        key = (board.bitboards.get(mover.getSymbol().upper(), 0), board.occupied, depth)
+        hit = cache.get(key)
+        if hit is not None:
+            return list(hit)
+    counts = [0] * (FIELDS * depth)
+    size = board.size
+    for cell in board.empty_cells():
+        board.make(Move.of(cell // size, cell % size, mover))
+        counts[NODES] += 1
+        if board.state == GameState.WIN:
+            counts[WINS] += 1
+        elif board.state == GameState.DRAW:
+            counts[DRAWS] += 1
+        elif depth > 1:
+            for i, n in enumerate(perft(board, other, mover, depth - 1, cache), FIELDS):
+                counts[i] += n
+        board.unmake()
+    if key is not None:
+        cache[key] = tuple(counts)
+    return counts
+
+def position(size: int, win_length: int, moves: List[int]) -> Tuple[Board, Player, Player]:
+    # Plays `moves` (flat cell indices, X first) and returns the board with
+    # the player to move and the other one
+    board = Board(size, win_length)
+    mover, other = Player("X", "Player X"), Player("O", "Player O")
+    for cell in moves:
+        if board.state != GameState.RUNNING:
+            raise ValueError("the game is already over before the last move")
+        if not 0 <= cell < board.n_cells:
+            raise ValueError(f"cell {cell} is off the board")
+        board.make(Move.of(cell // size, cell % size, mover))
+        mover, other = other, mover
+    return board, mover, other
+
+# -------------------
+# Parallel split
+# -------------------
+
+# Per-process state, built once by init_worker
+_worker: Dict[str, object] = {}
+
+def init_worker(config: Dict[str, object]) -> None:
+    _worker.clear()
+    _worker.update(config)
+    _worker["cache"] = {} if config["cache"] else None
+
+def run_subtree(prefix: Tuple[int, ...]) -> Tuple[int, List[int]]:
+    # Counts below the position reached by playing `prefix` from the root.
+    # The cache lives as long as the worker, so later subtrees reuse it.
+    config = _worker
+    board, mover, other = position(config["size"], config["win_length"], config["moves"] + list(prefix))
+    depth = config["depth"] - len(prefix)
+    return len(prefix), perft(board, mover, other, depth, config["cache"])
+
+def split(board: Board, mover: Player, other: Player, depth: int, split_depth: int,
+          counts: List[int], prefix: Tuple[int, ...] = ()) -> List[Tuple[int, ...]]:
+    # Counts the plies above split_depth here and returns the move prefixes
+    # of the running positions at split_depth, one task each
+    tasks = []
+    size = board.size
+    ply = len(prefix)
+    for cell in board.empty_cells():
+        board.make(Move.of(cell // size, cell % size, mover))
+        counts[FIELDS*ply + NODES] += 1
+        if board.state == GameState.WIN:
+            counts[FIELDS*ply + WINS] += 1
+        elif board.state == GameState.DRAW:
+            counts[FIELDS*ply + DRAWS] += 1
+        elif ply + 1 < depth:
+            if ply + 1 < split_depth:
+                tasks += split(board, other, mover, depth, split_depth, counts, prefix + (cell,))
+            else:
+                tasks.append(prefix + (cell,))
+        board.unmake()
+    return tasks
+
+def count(config: Dict[str, object], workers: int, split_depth: int) -> List[int]:
+    board, mover, other = position(config["size"], config["win_length"], config["moves"])
+    depth = config["depth"]
+    if board.state != GameState.RUNNING or depth <= 0:
+        return []
+    if workers <= 1:
+        return perft(board, mover, other, depth, {} if config["cache"] else None)
+    counts = [0] * (FIELDS * depth)
+    tasks = split(board, mover, other, depth, max(1, min(split_depth, depth - 1)), counts)
+    with mp.Pool(workers, initializer=init_worker, initargs=(config,)) as pool:
+        for offset, part in pool.imap_unordered(run_subtree, tasks):
+            for i, n in enumerate(part, FIELDS * offset):
+                counts[i] += n
+    return counts
+
+# -------------------
+# Reporting
+# -------------------
+
+def check(counts: List[int]) -> List[str]:
+    # Differences from REFERENCE_3X3 for the plies that were counted
+    errors = []
+    for ply in range(1, len(counts) // FIELDS + 1):
+        got = tuple(counts[FIELDS*(ply - 1):FIELDS*ply])
+        if got != REFERENCE_3X3[ply]:
+            errors.append(f"ply {ply}: expected {REFERENCE_3X3[ply]}, got {got}")
+    return errors
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Count the Tic-Tac-Toe game tree (perft)")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument("--depth", type=int, default=None, help="plies to walk (default: to the end)")
+    parser.add_argument("--moves", default="",
+                        help="comma-separated flat cell indices played first, X to start")
+    parser.add_argument("--cache", action="store_true", help="reuse counts of transposed positions")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--split-depth", type=int, default=2,
+                        help="ply at which subtrees are handed to the workers")
+    parser.add_argument("--check", action="store_true",
+                        help="compare with the known counts (empty 3x3 board only)")
+    args = parser.parse_args(argv)
+
+    try:
+        moves = [int(cell) for cell in args.moves.split(",") if cell.strip()]
+    except ValueError:
+        parser.error("--moves takes comma-separated cell indices")
+    config = {
+        "size": args.size,
+        "win_length": args.win_length or args.size,
+        "moves": moves,
+        "depth": args.depth if args.depth is not None else args.size * args.size - len(moves),
+        "cache": args.cache,
+    }
+    if args.check and (config["size"], config["win_length"], moves) != (3, 3, []):
+        parser.error("--check only has reference counts for the empty 3x3 board")
+    if args.check and config["depth"] > len(REFERENCE_3X3):
+        parser.error(f"--check only has reference counts for up to {len(REFERENCE_3X3)} plies")
+    try:
+        position(config["size"], config["win_length"], moves)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    counts = count(config, args.workers, args.split_depth)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'ply':>4} {'nodes':>14} {'wins':>12} {'draws':>12} {'terminal':>12}")
+    total = terminal = 0
+    for ply in range(len(counts) // FIELDS):
+        nodes, wins, draws = counts[FIELDS*ply:FIELDS*(ply + 1)]
+        total += nodes
+        terminal += wins + draws
+        print(f"{ply + 1:>4} {nodes:>14,} {wins:>12,} {draws:>12,} {wins + draws:>12,}")
+    print(f"{total:,} nodes, {terminal:,} terminal positions in {elapsed:.2f}s "
+          f"({total / max(elapsed, 1e-9):,.0f} nodes/s on {args.workers} workers"
+          f"{', cached' if args.cache else ''})")
+
+    if args.check:
+        errors = check(counts)
+        if errors:
+            print(f"\n{len(errors)} mismatch(es) with the reference counts:")
+            for line in errors:
+                print("  " + line)
+            return 1
+        print("\nMatches the reference counts")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
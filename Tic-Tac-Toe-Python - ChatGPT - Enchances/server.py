@@ -0,0 +1,26 @@
+
+import argparse
+import asyncio
+from Server.GameServer import GameServer
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe game server (line-delimited JSON over TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--idle-timeout", type=float, default=300.0,
+                        help="seconds before an untouched session is dropped")
+    parser.add_argument("--record-dir", help="archive finished games to record files in this directory")
+    parser.add_argument("--metrics-port", type=int,
+                        help="serve latency histograms and counters on this port (/metrics, /metrics.json)")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        from Game import Metrics
+        Metrics.enable()
+        Metrics.METRICS.serve(args.host, args.metrics_port)
+
+    server = GameServer(idle_timeout=args.idle_timeout, record_dir=args.record_dir)
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,179 @@
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from Game.Board import Board, GameState
+from Game.Move import Move
+from Game.Player import Player
+from Game.Record import X_WIN, O_WIN, DRAW, RecordLayout, RecordWriter, board_record
+from Game.Strategies import STRATEGIES, Strategy, make_strategy
+
+# Headless self-play: drives Board/Move with pluggable strategies, no Tk.
+# Games are split into chunks; each worker plays its chunk and streams back
+# one running aggregate, so memory stays flat however many games are run.
+# With --record, each chunk also sends back its games as packed records.
+
+# Per-process state, built once by init_worker
+_worker: Dict[str, object] = {}
+
+def init_worker(config: Dict[str, object]) -> None:
+    # The strategies are built once per worker, so tables, searches and
+    # loaded files are reused across chunks. They all draw from one
+    # generator, which each chunk reseeds.
+    _worker.clear()
+    _worker.update(config)
+    size = config["size"]
+    win_length = config["win_length"]
+    rng = random.Random()
+    _worker["rng"] = rng
+    # Named after their strategies, so a failing one can be told apart
+    _worker["players"] = (Player("X", config["x"]), Player("O", config["o"]))
+    _worker["strategies"] = (make_strategy(config["x"], rng, size, win_length),
+                             make_strategy(config["o"], rng, size, win_length))
+
+def play_game(board: Board, players: Tuple[Player, Player],
+              strategies: Tuple[Strategy, Strategy], first: int) -> Tuple[int, int]:
+    # Returns (result, number of moves)
+    board.reset()
+    turn = first
+    while board.state == GameState.RUNNING:
+        player = players[turn]
+        cell = strategies[turn](board, player)
+        if cell is None:
+            # Counting this as a draw would hide a broken strategy
+            raise RuntimeError(f"the {player.getName()} strategy returned no move on a running board")
+        board.make(Move.of(cell[0], cell[1], player))
+        if board.state == GameState.RUNNING:
+            turn ^= 1
+    if board.state == GameState.WIN:
+        return (X_WIN if turn == 0 else O_WIN), board.n_moves
+    return DRAW, board.n_moves
+
+def new_totals() -> Dict[str, int]:
+    return {"games": 0, "x_wins": 0, "o_wins": 0, "draws": 0, "moves": 0,
+            "x_first": 0, "x_first_wins": 0, "o_first_wins": 0}
+
+def merge_totals(total: Dict[str, int], part: Dict[str, int]) -> None:
+    for key, value in part.items():
+        total[key] = total.get(key, 0) + value
+
+def run_chunk(task: Tuple[int, int]) -> Dict[str, int]:
+    chunk_index, n_games = task
+    config = _worker
+    size = config["size"]
+    win_length = config["win_length"]
+    config["rng"].seed(config["seed"] * 1_000_003 + chunk_index)
+    players = config["players"]
+    strategies = config["strategies"]
+    board = Board(size, win_length, early_draw=config["early_draw"])
+    totals = new_totals()
+    layout = RecordLayout(size, win_length, config["early_draw"]) if config.get("record") else None
+    records = bytearray()
+    for i in range(n_games):
+        first = i & 1 if config["alternate"] else 0
+        result, n_moves = play_game(board, players, strategies, first)
+        if layout is not None:
+            cells, _, _ = board_record(board)
+            records += layout.pack(cells, first, result, int(time.time()))
+        totals["games"] += 1
+        totals["moves"] += n_moves
+        if first == 0:
+            totals["x_first"] += 1
+        if result == X_WIN:
+            totals["x_wins"] += 1
+        elif result == O_WIN:
+            totals["o_wins"] += 1
+        else:
+            totals["draws"] += 1
+        if result != DRAW:
+            totals["x_first_wins" if (result == X_WIN) == (first == 0) else "o_first_wins"] += 1
+    if layout is not None:
+        totals["records"] = bytes(records)
+    return totals
+
+def chunks(games: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    index = 0
+    while games > 0:
+        n = min(chunk_size, games)
+        yield index, n
+        games -= n
+        index += 1
+
+def simulate(config: Dict[str, object], games: int, workers: int,
+             chunk_size: int) -> Iterator[Dict[str, int]]:
+    # Yields each chunk's aggregate as soon as it finishes
+    tasks = chunks(games, chunk_size)
+    if workers <= 1:
+        init_worker(config)
+        for task in tasks:
+            yield run_chunk(task)
+        return
+    with mp.Pool(workers, initializer=init_worker, initargs=(config,)) as pool:
+        for part in pool.imap_unordered(run_chunk, tasks):
+            yield part
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless Tic-Tac-Toe self-play")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument("--x", choices=sorted(STRATEGIES), default="random")
+    parser.add_argument("--o", choices=sorted(STRATEGIES), default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-alternate", dest="alternate", action="store_false",
+                        help="X always moves first")
+    parser.add_argument("--early-draw", action="store_true",
+                        help="end a game as a draw once no line can be completed")
+    parser.add_argument("--quiet", action="store_true", help="only print the final summary")
+    parser.add_argument("--record", metavar="PATH", help="append every game to a record file")
+    args = parser.parse_args(argv)
+
+    config = {
+        "size": args.size,
+        "win_length": args.win_length or args.size,
+        "x": args.x,
+        "o": args.o,
+        "seed": args.seed,
+        "alternate": args.alternate,
+        "early_draw": args.early_draw,
+        "record": bool(args.record),
+    }
+    # Workers build their strategies in the pool initializer, where an error
+    # would only make the pool start new workers; check them here instead
+    for name in sorted({args.x, args.o}):
+        try:
+            make_strategy(name, None, config["size"], config["win_length"])
+        except ValueError as e:
+            parser.error(str(e))
+    writer = (RecordWriter(args.record, config["size"], config["win_length"], early_draw=args.early_draw)
+              if args.record else None)
+    totals = new_totals()
+    start = time.perf_counter()
+    for part in simulate(config, args.games, args.workers, args.chunk_size):
+        records = part.pop("records", None)
+        if writer is not None and records:
+            writer.append_raw(records)
+        merge_totals(totals, part)
+        if not args.quiet:
+            elapsed = time.perf_counter() - start
+            print(f"{totals['games']}/{args.games} games, "
+                  f"{totals['games'] / elapsed:,.0f} games/s", flush=True)
+    elapsed = time.perf_counter() - start
+    if writer is not None:
+        writer.close()
+
+    games = max(1, totals["games"])
+    print(f"X ({args.x}) wins: {totals['x_wins']} ({100 * totals['x_wins'] / games:.1f}%)")
+    print(f"O ({args.o}) wins: {totals['o_wins']} ({100 * totals['o_wins'] / games:.1f}%)")
+    print(f"Draws: {totals['draws']} ({100 * totals['draws'] / games:.1f}%)")
+    print(f"Average length: {totals['moves'] / games:.2f} moves")
+    print(f"{totals['games']} games in {elapsed:.2f}s "
+          f"({totals['games'] / max(elapsed, 1e-9):,.0f} games/s on {args.workers} workers)")
+
+if __name__ == "__main__":
+    main()
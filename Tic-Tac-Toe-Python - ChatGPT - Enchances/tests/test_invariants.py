@@ -0,0 +1,142 @@
+import random
+import pytest
+from Game.Board import Board, GameState
+from Game.Codec import Codec
+from Game.Move import Move
+from Game.Player import Player
+
+PLAYERS = (Player("X", "Player X"), Player("O", "Player O"))
+
+# (size, win_length, games)
+GEOMETRIES = [(3, 3, 300), (5, 4, 100), (15, 5, 20)]
+
+def random_game(size, win_length, rng, early_draw=False, near_radius=0):
+    # A finished random game and the board after every move, oldest first
+    board = Board(size, win_length, near_radius, early_draw)
+    positions = []
+    turn = 0
+    while board.state == GameState.RUNNING:
+        cell = rng.choice(board.empty)
+        board.make(Move.of(cell // size, cell % size, PLAYERS[turn]))
+        positions.append(board.copy())
+        turn ^= 1
+    return board, positions
+
+def snapshot(board):
+    return (
+        [row[:] for row in board.board_matrix],
+        dict(board.bitboards),
+        board.occupied,
+        board.empty[:],
+        board.empty_pos[:],
+        board.near_count[:],
+        len(board.history),
+        board.n_moves,
+        board.last_index,
+        board.state,
+        None if board.win_line is None else list(board.win_line),
+        dict(board.touched_lines),
+        board.dead_lines,
+        len(board.line_undo),
+    )
+
+# -------------------
+# Batch vs Board
+# -------------------
+
+@pytest.mark.parametrize("size, win_length, games", GEOMETRIES)
+def test_batch_matches_board(size, win_length, games):
+    pytest.importorskip("numpy")
+    from Game.Batch import NO_LINE, O, X, encode_boards, evaluate
+    rng = random.Random(size * 100 + win_length)
+    lines = Board.win_lines(size, win_length)
+    for _ in range(games):
+        _, positions = random_game(size, win_length, rng)
+        state, winner, line = evaluate(encode_boards(positions), win_length)
+        for i, board in enumerate(positions):
+            assert state[i] == board.state.value
+            if board.state == GameState.WIN:
+                symbol = board.history[-1][0].getMove()[2].upper()
+                assert winner[i] == (X if symbol == "X" else O)
+                assert lines[line[i]] == board.win_line[:win_length]
+            else:
+                assert line[i] == NO_LINE
+
+# -------------------
+# make / unmake
+# -------------------
+
+@pytest.mark.parametrize("size, win_length, games", GEOMETRIES)
+@pytest.mark.parametrize("early_draw", [False, True])
+def test_unmake_restores_every_position(size, win_length, games, early_draw):
+    rng = random.Random(size * 100 + win_length + early_draw)
+    for _ in range(games):
+        board = Board(size, win_length, near_radius=1, early_draw=early_draw)
+        before = []
+        turn = 0
+        while board.state == GameState.RUNNING:
+            before.append(snapshot(board))
+            cell = rng.choice(board.empty)
+            board.make(Move.of(cell // size, cell % size, PLAYERS[turn]))
+            turn ^= 1
+        while before:
+            board.unmake()
+            assert snapshot(board) == before.pop()
+
+def test_reset_matches_a_new_board():
+    rng = random.Random(1)
+    board, _ = random_game(7, 4, rng, early_draw=True, near_radius=2)
+    board.reset()
+    assert snapshot(board) == snapshot(Board(7, 4, near_radius=2, early_draw=True))
+
+# -------------------
+# Codec round trips
+# -------------------
+
+@pytest.mark.parametrize("size, win_length, games", GEOMETRIES)
+def test_codec_round_trip(size, win_length, games):
+    codec = Codec(size)
+    rng = random.Random(size * 100 + win_length)
+    for _ in range(games):
+        _, positions = random_game(size, win_length, rng)
+        for board in positions:
+            code = codec.encode(board)
+            x_bits = board.bitboards.get("X", 0)
+            assert codec.decode_bits(code) == (x_bits, board.occupied & ~x_bits)
+            rebuilt = codec.to_board(code, *PLAYERS, win_length)
+            assert codec.encode(rebuilt) == code
+            assert rebuilt.state == board.state
+
+@pytest.mark.parametrize("size", [3, 4])
+def test_canonical_is_symmetry_invariant(size):
+    codec = Codec(size)
+    rng = random.Random(size)
+    for _ in range(50):
+        board, _ = random_game(size, size, rng)
+        x_bits = board.bitboards.get("X", 0)
+        o_bits = board.occupied & ~x_bits
+        canonical = codec.canonical(board)
+        for sym in range(len(codec.perms)):
+            moved = codec.canonical_bits(codec.transform(x_bits, sym), codec.transform(o_bits, sym))[0]
+            assert moved == canonical
+
+@pytest.mark.parametrize("size, win_length, games", [(3, 3, 100), (4, 3, 50), (5, 4, 50)])
+def test_array_codec_matches_scalar(size, win_length, games):
+    np = pytest.importorskip("numpy")
+    from Game.Batch import encode_boards
+    from Game.Codec import decode_array, encode_array
+    codec = Codec(size)
+    rng = random.Random(size * 100 + win_length)
+    boards = []
+    for _ in range(games):
+        boards += random_game(size, win_length, rng)[1]
+    cells = encode_boards(boards)
+    codes = encode_array(cells, size)
+    assert codes.tolist() == [codec.encode(board) for board in boards]
+    assert np.array_equal(decode_array(codes, size), cells)
+
+def test_encode_no_boards_keeps_the_width():
+    pytest.importorskip("numpy")
+    from Game.Batch import encode_boards
+    assert encode_boards([]).shape == (0, 9)
+    assert encode_boards([], size=15).shape == (0, 225)
@@ -0,0 +1,56 @@
+import json
+from Server.GameServer import GameServer
+
+def call(server, **request):
+    return server.dispatch(json.dumps(request).encode())
+
+def test_resign_before_opponent_joins():
+    server = GameServer()
+    created = call(server, op="create", name="alice")
+    reply = call(server, op="resign", session=created["session"], token=created["token"])
+    assert reply == {"ok": False, "error": "waiting for an opponent"}
+    # The session is still usable afterwards
+    state = call(server, op="state", session=created["session"])
+    assert state["ok"] and state["state"] == "RUNNING" and state["winner"] is None
+
+def test_resign_after_join():
+    server = GameServer()
+    created = call(server, op="create", name="alice")
+    call(server, op="join", session=created["session"], name="bob")
+    reply = call(server, op="resign", session=created["session"], token=created["token"])
+    assert reply["ok"] and reply["state"] == "RESIGNED" and reply["winner"] == "O"
+
+def test_move_rejects_non_integer_cells():
+    server = GameServer()
+    created = call(server, op="create", name="alice")
+    call(server, op="join", session=created["session"], name="bob")
+    session, token = created["session"], created["token"]
+    for bad in (b"1e999", b"2.5", b'"1"', b"true"):
+        line = b'{"op": "move", "session": %d, "token": "%s", "row": %s, "col": 0}' % (session, token.encode(), bad)
+        reply = server.dispatch(line)
+        assert reply == {"ok": False, "error": "row must be an integer"}
+    assert call(server, op="move", session=session, token=token, row=0, col=0)["ok"]
+
+def test_create_rejects_non_integer_size():
+    server = GameServer()
+    reply = server.dispatch(b'{"op": "create", "size": 1e999}')
+    assert reply == {"ok": False, "error": "size must be an integer"}
+
+def resign_game(server):
+    created = call(server, op="create", name="alice")
+    call(server, op="join", session=created["session"], name="bob")
+    return call(server, op="resign", session=created["session"], token=created["token"])
+
+def test_record_dir_is_created(tmp_path):
+    record_dir = tmp_path / "missing" / "records"
+    server = GameServer(record_dir=str(record_dir))
+    assert resign_game(server)["ok"]
+    server.flush_records()
+    assert (record_dir / "games-3x3k3.ttr").stat().st_size > 0
+
+def test_archive_failure_still_replies(tmp_path):
+    server = GameServer(record_dir=str(tmp_path))
+    # A directory where the record file should go makes opening it fail
+    (tmp_path / "games-3x3k3.ttr").mkdir()
+    reply = resign_game(server)
+    assert reply["ok"] and reply["state"] == "RESIGNED"
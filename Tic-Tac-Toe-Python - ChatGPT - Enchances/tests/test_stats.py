@@ -0,0 +1,28 @@
+import sqlite3
+import pytest
+from Game.Stats import GameEvent, StatsStore
+
+def test_reads_include_every_queued_game(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.sqlite3"))
+    try:
+        for winner in ("X", "X", "O", None):
+            store.record_game(GameEvent("3x3", "alice", "bob", winner, 7))
+        totals = store.variant_totals("3x3").result(timeout=5)
+        assert (totals["x_wins"], totals["o_wins"], totals["draws"]) == (2, 1, 1)
+        assert store.recent_win_rates(["alice", "bob"], "3x3", 20).result(timeout=5) == [(4, 50.0), (4, 25.0)]
+    finally:
+        store.close()
+
+def test_write_failure_fails_reads(tmp_path):
+    path = str(tmp_path / "stats.sqlite3")
+    store = StatsStore(path)
+    try:
+        store.variant_totals("3x3").result(timeout=5)
+        with sqlite3.connect(path) as conn:
+            conn.execute("DROP TABLE player_games")
+        store.record_game(GameEvent("3x3", "alice", "bob", "X", 5))
+        for future in (store.variant_totals("3x3"), store.player_totals("alice", "3x3")):
+            with pytest.raises(sqlite3.OperationalError):
+                future.result(timeout=5)
+    finally:
+        store.close()
@@ -1,6 +1,8 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import tkinter as tk
 from tkinter import messagebox
+from GUI.App.BoardCanvas import BoardCanvas
+from GUI.App.AIWorker import AIWorker, engine_for
 from Game.Board import Board, GameState
 from Game.Player import Player
 from Game.Move import Move
@@ -10,7 +12,7 @@ class TicTacToeApp(tk.Tk):
         super().__init__()
 
         self.title("Tic-Tac-Toe")
-        self.geometry("300x400")
+        self.geometry("300x430")
         self.resizable(False, False)
 
         # Players
@@ -21,32 +23,49 @@ class TicTacToeApp(tk.Tk):
         # Board
         self.board: Board = Board()
 
+        # Computer opponent: the player it moves for (None when off) and the
+        # background worker that searches for its moves
+        self.computer: Optional[Player] = None
+        self.ai = AIWorker(self, engine_for(self.board.size, self.board.win_length), self.on_computer_move,
+                           on_error=self.on_computer_error)
+
         # Score
         self.score = {"X":0, "O":0}
 
+        # Moves taken back with Undo, most recent last
+        self.redo_moves: List[Move] = []
+
         # Scoreboard
         self.score_label = tk.Label(self, text=self.get_score_text(), font=("Arial",14))
         self.score_label.pack(pady=10)
 
-        # Board buttons
-        self.board_frame = tk.Frame(self)
-        self.board_frame.pack()
-        self.buttons: List[List[Optional[tk.Button]]] = [[None]*3 for _ in range(3)]
-        for r in range(3):
-            for c in range(3):
-                btn = tk.Button(
-                    self.board_frame, text="", font=("Arial",24), width=4, height=2,
-                    command=lambda row=r, col=c: self.make_move(row,col)
-                )
-                btn.grid(row=r,column=c)
-                self.buttons[r][c] = btn
-
         # Default button background (platform-independent)
         self.default_btn_bg = tk.Button(self).cget("bg")
 
-        # Restart button
-        self.restart_btn = tk.Button(self, text="Restart", font=("Arial",12), command=self.restart_game)
-        self.restart_btn.pack(pady=10)
+        # Board, drawn on a single canvas
+        self.board_canvas = BoardCanvas(
+            self, size=self.board.size, cell_px=90, gap=2, font=("Arial",24),
+            bg="gray", cell_bg=self.default_btn_bg, on_click=self.make_move
+        )
+        self.board_canvas.pack()
+
+        # Control buttons
+        self.control_frame = tk.Frame(self)
+        self.control_frame.pack(pady=10)
+        self.undo_btn = tk.Button(self.control_frame, text="Undo", font=("Arial",12), command=self.undo_move)
+        self.undo_btn.pack(side=tk.LEFT, padx=5)
+        self.restart_btn = tk.Button(self.control_frame, text="Restart", font=("Arial",12), command=self.restart_game)
+        self.restart_btn.pack(side=tk.LEFT, padx=5)
+        self.redo_btn = tk.Button(self.control_frame, text="Redo", font=("Arial",12), command=self.redo_move)
+        self.redo_btn.pack(side=tk.LEFT, padx=5)
+
+        # Computer opponent toggle
+        self.vs_computer = tk.BooleanVar(value=False)
+        self.computer_check = tk.Checkbutton(self, text="Computer plays O", font=("Arial",12),
+                                             variable=self.vs_computer, command=self.toggle_computer)
+        self.computer_check.pack()
+
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
     # -------------------
     # Utility functions
@@ -67,17 +86,75 @@ class TicTacToeApp(tk.Tk):
         else:
             self.x_btn.config(bg="gray")
 
+    def toggle_computer(self) -> None:
+        if self.vs_computer.get():
+            self.computer = self.player_o
+            self.start_computer_turn()
+        else:
+            self.computer = None
+            self.ai.cancel()
+
+    def start_computer_turn(self) -> None:
+        # Runs after every move; searches only when it is the computer's turn
+        if (self.computer is None or self.current_player is not self.computer or self.ai.busy
+                or self.board.state != GameState.RUNNING):
+            return
+        opponent = self.player_x if self.computer is self.player_o else self.player_o
+        self.ai.request(self.board, self.computer, opponent)
+
+    def on_computer_move(self, cell: Tuple[int,int]) -> None:
+        # Delivered on the Tk thread by the worker's poll
+        if self.current_player is not self.computer:
+            return
+        self.redo_moves.clear()
+        self.play(Move.of(cell[0], cell[1], self.computer))
+
+    def on_computer_error(self, error: BaseException) -> None:
+        # The engine failed: hand the game back to the humans
+        self.vs_computer.set(False)
+        self.computer = None
+        messagebox.showerror("Computer opponent", f"The computer could not move:\n{error}")
+
     def make_move(self, row: int, col: int) -> None:
-        if self.board.board_matrix[row][col] != "":
+        if self.current_player is self.computer or not self.board.is_free(row, col):
             return
 
-        move = Move(row, col, self.current_player)
-        self.board.update_board(move)
+        self.redo_moves.clear()
+        self.play(Move.of(row, col, self.current_player))
 
-        # Update button text
-        btn = self.buttons[row][col]
-        assert btn is not None
-        btn.config(text=self.current_player.getSymbol())
+    def undo_move(self) -> None:
+        if not self.board.history:
+            return
+        self.ai.cancel()
+        self.take_back()
+        # Against the computer, take back its reply as well
+        if self.current_player is self.computer and self.board.history:
+            self.take_back()
+        self.start_computer_turn()
+
+    def take_back(self) -> None:
+        move = self.board.unmake()
+        self.redo_moves.append(move)
+        row, col, _ = move.getMove()
+        self.board_canvas.clear_cell(row, col)
+        self.current_player = move.getPlayer()
+
+    def redo_move(self) -> None:
+        if not self.redo_moves:
+            return
+        self.ai.cancel()
+        self.play(self.redo_moves.pop())
+        # Against the computer, replay its reply instead of searching again
+        if self.current_player is self.computer and self.redo_moves:
+            self.play(self.redo_moves.pop())
+
+    def play(self, move: Move) -> None:
+        row, col, _ = move.getMove()
+        self.current_player = move.getPlayer()
+        self.board.make(move)
+
+        # Update cell text
+        self.board_canvas.set_cell(row, col, text=self.current_player.getSymbol())
 
         # Check for win/draw
         if self.board.state == GameState.WIN:
@@ -86,30 +163,37 @@ class TicTacToeApp(tk.Tk):
             self.score_label.config(text=self.get_score_text())
             messagebox.showinfo("Winner", f"{self.current_player.getName()} wins!")
             self.board.reset()
+            self.redo_moves.clear()
             self.reset_buttons()
         elif self.board.state == GameState.DRAW:
             messagebox.showinfo("Draw", "It's a draw!")
             self.board.reset()
+            self.redo_moves.clear()
             self.reset_buttons()
         else:
             self.current_player = self.player_o if self.current_player == self.player_x else self.player_x
+        # Let the board redraw before the computer starts thinking
+        self.after_idle(self.start_computer_turn)
 
     def highlight_win_line(self) -> None:
         for r, c in (self.board.win_line or []):
-            btn = self.buttons[r][c]
-            assert btn is not None
-            btn.config(bg="lightgreen")
+            self.board_canvas.set_cell(r, c, bg="lightgreen")
+        # Show the line before the dialog blocks the event loop
+        self.board_canvas.flush()
 
     def reset_buttons(self) -> None:
-        for r in range(3):
-            for c in range(3):
-                btn = self.buttons[r][c]
-                assert btn is not None
-                btn.config(text="", bg=self.default_btn_bg)
+        self.board_canvas.reset()
 
     def restart_game(self) -> None:
+        self.ai.cancel()
         self.score = {"X":0,"O":0}
         self.score_label.config(text=self.get_score_text())
         self.board.reset()
+        self.redo_moves.clear()
         self.reset_buttons()
         self.current_player = self.player_x
+        self.start_computer_turn()
+
+    def on_closing(self) -> None:
+        self.ai.cancel()
+        self.destroy()
@@ -0,0 +1,255 @@
+import os
+import time
+from typing import Callable, Optional, Tuple
+import numpy as np
+from ..Batch import evaluate
+from ..Board import Board, GameState
+from ..Codec import FIRST, SECOND, ReachableIndex, decode_array
+from ..Player import Player
+from .SolutionTable import WIN, SolutionTable
+
+# Self-play TD(0) learner for the classic 3x3 game (needs NumPy).
+#
+# The value table holds, for every position that can come up in play, the
+# expected score of the player who moved first (1 win, 0.5 draw, 0 loss).
+# It is a NumPy array indexed by the position's rank in a ReachableIndex
+# (Game/Codec.py), so looking up a batch of positions is one fancy index.
+#
+# Training plays a whole batch of games at once as an (N, 9) array of
+# cells. Every ply, each game moves greedily on the table (the first player
+# maximising, the second minimising) or, with probability epsilon, at
+# random. After a greedy move the previous position is nudged towards the
+# new one; the updates of a ply are averaged per position with bincount
+# and applied together. Finished positions keep their true score.
+#
+# Convergence is measured against perfect play: agreement() is the share
+# of running positions in which the greedy move is one the SolutionTable
+# rates optimal.
+
+SIZE = 3
+N_CELLS = SIZE * SIZE
+POWERS = 3 ** np.arange(N_CELLS, dtype=np.int64)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "learned.npz")
+DEFAULT_GAMES = 200_000
+
+class TrainStats:
+    def __init__(self):
+        self.games = 0
+        self.batches = 0
+        self.seconds = 0.0
+        self.first_wins = 0
+        self.second_wins = 0
+        self.draws = 0
+
+    def gps(self) -> float:
+        return self.games / self.seconds if self.seconds else 0.0
+
+class Learner:
+    def __init__(self, alpha: float = 0.3, epsilon: float = 0.1, seed: Optional[int] = None):
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
+        self.index = ReachableIndex(SIZE)
+        # code -> rank (-1 for codes that cannot occur) and rank -> code
+        self.ranks = np.frombuffer(self.index.ranks, dtype=np.int32)
+        self.codes = np.frombuffer(self.index.codes, dtype=np.int64)
+        state, winner, _ = evaluate(decode_array(self.codes, SIZE))
+        self.terminal = state != GameState.RUNNING.value
+        self.rewards = np.where(winner == FIRST, 1.0, np.where(winner == SECOND, 0.0, 0.5))
+        self.values = np.where(self.terminal, self.rewards, 0.5)
+        self.games = 0
+        self.stats = TrainStats()
+        self._optimal: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def play_batch(self, n_games: int, stats: TrainStats) -> None:
+        cells = np.zeros((n_games, N_CELLS), dtype=np.int8)
+        codes = np.zeros(n_games, dtype=np.int64)
+        prev = np.full(n_games, self.ranks[0], dtype=np.int64)
+        active = np.arange(n_games)
+        values = self.values
+        n_states = len(values)
+        for ply in range(N_CELLS):
+            if not len(active):
+                break
+            digit, sign = (FIRST, 1.0) if ply % 2 == 0 else (SECOND, -1.0)
+            free = cells[active] == 0
+            after = codes[active, None] + digit * POWERS
+            after_rank = self.ranks[np.where(free, after, 0)]
+            # Greedy for the mover, ties broken at random
+            score = sign * values[after_rank] + self.rng.random(after.shape) * 1e-9
+            explore = self.rng.random(len(active)) < self.epsilon
+            score[explore] = self.rng.random((int(explore.sum()), N_CELLS))
+            score[~free] = -np.inf
+            choice = score.argmax(axis=1)
+            rows = np.arange(len(active))
+            new_rank = after_rank[rows, choice]
+
+            # TD(0) after greedy moves, averaged over games in one position
+            learn = ~explore
+            old = prev[active][learn]
+            delta = values[new_rank[learn]] - values[old]
+            sums = np.bincount(old, weights=delta, minlength=n_states)
+            counts = np.bincount(old, minlength=n_states)
+            seen = counts > 0
+            values[seen] += self.alpha * sums[seen] / counts[seen]
+
+            cells[active, choice] = digit
+            codes[active] = after[rows, choice]
+            prev[active] = new_rank
+            done = self.terminal[new_rank]
+            ended = self.rewards[new_rank[done]]
+            stats.first_wins += int((ended == 1.0).sum())
+            stats.second_wins += int((ended == 0.0).sum())
+            stats.draws += int((ended == 0.5).sum())
+            active = active[~done]
+        stats.games += n_games
+        stats.batches += 1
+        self.games += n_games
+
+    def train(self, games: int, batch_size: int = 2048, checkpoint: Optional[str] = None,
+              save_every: float = 5.0, report: Optional[Callable[[TrainStats], None]] = None,
+              report_every: int = 20) -> TrainStats:
+        self.stats = stats = TrainStats()
+        start = time.perf_counter()
+        last_save = time.monotonic()
+        while stats.games < games:
+            self.play_batch(min(batch_size, games - stats.games), stats)
+            stats.seconds = time.perf_counter() - start
+            if checkpoint and time.monotonic() - last_save > save_every:
+                self.save(checkpoint)
+                last_save = time.monotonic()
+            if report is not None and stats.batches % report_every == 0:
+                report(stats)
+        if checkpoint:
+            self.save(checkpoint)
+        return stats
+
+    # -------------------
+    # Playing
+    # -------------------
+
+    def best_move(self, board: Board, player: Player) -> Optional[Tuple[int,int]]:
+        if board.state != GameState.RUNNING:
+            return None
+        if (board.size, board.win_length) != (SIZE, SIZE):
+            raise ValueError("the learner only plays the classic 3x3 board")
+        mine = board.bitboards.get(player.getSymbol().upper(), 0)
+        theirs = board.occupied & ~mine
+        # The player with as many stones as the other is the one who moved first
+        if bin(mine).count("1") == bin(theirs).count("1"):
+            first, second, digit, sign = mine, theirs, FIRST, 1.0
+        else:
+            first, second, digit, sign = theirs, mine, SECOND, -1.0
+        code = self.index.codec.encode_bits(first, second)
+        best, best_cell = -np.inf, None
+        for cell in board.empty_cells():
+            rank = self.ranks[code + digit * 3**cell]
+            value = sign * self.values[rank] if rank >= 0 else 0.0
+            if value > best or (value == best and cell < best_cell):
+                best, best_cell = value, cell
+        return divmod(best_cell, SIZE) if best_cell is not None else None
+
+    # -------------------
+    # Convergence
+    # -------------------
+
+    def optimal_moves(self) -> Tuple[np.ndarray, np.ndarray]:
+        # (ranks of the running positions, (n, 9) mask of their optimal cells)
+        if self._optimal is None:
+            table = SolutionTable()
+            codec = self.index.codec
+            running = np.flatnonzero(~self.terminal)
+            optimal = np.zeros((len(running), N_CELLS), dtype=bool)
+            for row, rank in enumerate(running):
+                first, second = codec.decode_bits(int(self.codes[rank]))
+                mine, theirs = (first, second) if bin(first).count("1") == bin(second).count("1") else (second, first)
+                value = table.lookup(codec.encode_bits(mine, theirs))[0]
+                for cell in range(N_CELLS):
+                    if (mine | theirs) >> cell & 1:
+                        continue
+                    child = table.lookup(codec.encode_bits(theirs, mine | 1 << cell))[0]
+                    optimal[row, cell] = WIN - child == value
+            self._optimal = running, optimal
+        return self._optimal
+
+    def agreement(self) -> float:
+        # Share of running positions where the greedy move is optimal
+        running, optimal = self.optimal_moves()
+        cells = decode_array(self.codes[running], SIZE)
+        first_moves = (cells == FIRST).sum(axis=1) == (cells == SECOND).sum(axis=1)
+        digit = np.where(first_moves, FIRST, SECOND)[:, None]
+        sign = np.where(first_moves, 1.0, -1.0)[:, None]
+        free = cells == 0
+        after = self.codes[running, None] + digit * POWERS
+        score = sign * self.values[self.ranks[np.where(free, after, 0)]]
+        score[~free] = -np.inf
+        choice = score.argmax(axis=1)
+        return float(optimal[np.arange(len(running)), choice].mean())
+
+    # -------------------
+    # Checkpoints
+    # -------------------
+
+    def save(self, path: str = DEFAULT_PATH) -> None:
+        # Pool workers may train and save at the same time; each writes its
+        # own temporary file and the last rename wins
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, values=self.values, games=self.games, alpha=self.alpha, epsilon=self.epsilon)
+        os.replace(tmp, path)
+
+    def load(self, path: str = DEFAULT_PATH) -> None:
+        with np.load(path) as data:
+            if data["values"].shape != self.values.shape:
+                raise ValueError(f"{path} is not a {SIZE}x{SIZE} value table")
+            self.values = data["values"].astype(np.float64)
+            self.games = int(data["games"])
+
+    @classmethod
+    def load_or_train(cls, path: str = DEFAULT_PATH, seed: Optional[int] = None) -> "Learner":
+        # Trains and saves a table the first time; a read-only install keeps
+        # the trained table in memory
+        learner = cls(seed=seed)
+        if os.path.exists(path):
+            learner.load(path)
+            return learner
+        learner.train(DEFAULT_GAMES)
+        try:
+            learner.save(path)
+        except OSError:
+            pass
+        return learner
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Train the 3x3 value table by self-play")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES)
+    parser.add_argument("--batch-size", type=int, default=2048)
+    parser.add_argument("--alpha", type=float, default=0.3)
+    parser.add_argument("--epsilon", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--checkpoint", default=DEFAULT_PATH, help="table to resume from and save to")
+    parser.add_argument("--fresh", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--report-every", type=int, default=20, help="batches between progress lines")
+    args = parser.parse_args()
+
+    learner = Learner(args.alpha, args.epsilon, args.seed)
+    if os.path.exists(args.checkpoint) and not args.fresh:
+        learner.load(args.checkpoint)
+        print(f"resuming from {args.checkpoint} after {learner.games:,} games")
+    # Solve the reference moves now, so the first report does not slow training
+    learner.optimal_moves()
+
+    def report(stats: TrainStats) -> None:
+        print(f"{learner.games:>10,} games, {stats.gps():>9,.0f} games/s, "
+              f"{learner.agreement():.1%} optimal moves", flush=True)
+
+    stats = learner.train(args.games, args.batch_size, args.checkpoint,
+                          report=report, report_every=args.report_every)
+    games = max(1, stats.games)
+    print(f"{stats.games:,} games in {stats.seconds:.2f}s ({stats.gps():,.0f} games/s): "
+          f"first player {stats.first_wins / games:.1%}, second {stats.second_wins / games:.1%}, "
+          f"draws {stats.draws / games:.1%}")
+    print(f"greedy move is optimal in {learner.agreement():.1%} of {len(learner.optimal_moves()[0]):,} "
+          f"running positions; table saved to {args.checkpoint}")
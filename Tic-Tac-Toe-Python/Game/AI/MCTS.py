@@ -0,0 +1,288 @@
+import math
+import multiprocessing as mp
+import random
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from ..Board import Board, GameState
+from ..Move import Move
+from ..Player import Player
+from .Search import opponent_of
+
+# Monte Carlo Tree Search with UCT selection and random playouts.
+#
+# An anytime engine: it keeps improving its estimate until a playout or time
+# budget runs out, so it stays usable on boards far too big to search
+# exhaustively. On boards larger than NEAR_SIZE, new nodes only consider
+# cells within NEAR_RADIUS of a stone, which keeps the branching factor
+# close to the number of moves that matter.
+#
+# With workers > 1 the search uses root parallelism: every worker process
+# grows its own tree from the same position with its own seed, and the
+# visit counts of the root moves are summed before the most visited move
+# is chosen. The trees never have to be shared, so nothing but the root
+# statistics crosses the process boundary.
+
+NEAR_SIZE = 5
+NEAR_RADIUS = 2
+
+class Node:
+    __slots__ = ("cell", "parent", "player", "children", "untried", "visits", "wins")
+
+    def __init__(self, cell: int, parent: Optional["Node"], player: Player, untried: List[int]):
+        self.cell = cell
+        self.parent = parent
+        # The player who made the move leading here; wins are counted for them
+        self.player = player
+        self.children: List[Node] = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+def candidates(board: Board) -> List[int]:
+    # Free cells a new node will try, as flat indices
+    if board.state != GameState.RUNNING:
+        return []
+    return board.near_cells()
+
+def near_radius(size: int) -> int:
+    return NEAR_RADIUS if size > NEAR_SIZE else 0
+
+def tree_bytes(root: Node) -> int:
+    # Memory held by the tree: the nodes and their child/untried lists
+    total = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        total += sys.getsizeof(node) + sys.getsizeof(node.children) + sys.getsizeof(node.untried)
+        stack.extend(node.children)
+    return total
+
+class MCTSStats:
+    def __init__(self):
+        self.playouts = 0
+        self.nodes = 0
+        self.tree_bytes = 0
+        self.seconds = 0.0
+        self.workers = 1
+
+    def pps(self) -> float:
+        return self.playouts / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "playouts": self.playouts,
+            "nodes": self.nodes,
+            "tree_bytes": self.tree_bytes,
+            "seconds": self.seconds,
+            "playouts_per_second": self.pps(),
+            "workers": self.workers,
+        }
+
+class Tree:
+    def __init__(self, board: Board, player: Player, opponent: Player,
+                 exploration: float, rng: random.Random):
+        self.board = board
+        self.exploration = exploration
+        self.rng = rng
+        self.other = {player: opponent, opponent: player}
+        # The root "was reached" by the opponent's last move
+        self.root = Node(-1, None, opponent, candidates(board))
+        self.nodes = 1
+        self.playouts = 0
+
+    def run(self, playouts: Optional[int], seconds: Optional[float],
+            stop: Optional[threading.Event] = None) -> None:
+        deadline = None if seconds is None else time.perf_counter() + seconds
+        while playouts is None or self.playouts < playouts:
+            self.playout()
+            # Checking the clock is cheap, but not free on every playout
+            if self.playouts & 31 == 0:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                if stop is not None and stop.is_set():
+                    break
+
+    def playout(self) -> None:
+        board = self.board
+        size = board.size
+        rng = self.rng
+        c = self.exploration
+        node = self.root
+        depth = 0
+
+        # Selection: follow UCT through fully expanded nodes
+        while not node.untried and node.children:
+            log_n = math.log(node.visits)
+            best, best_score = None, -1.0
+            for child in node.children:
+                score = child.wins / child.visits + c * math.sqrt(log_n / child.visits)
+                if score > best_score:
+                    best, best_score = child, score
+            node = best
+            board.make(Move.of(node.cell // size, node.cell % size, node.player))
+            depth += 1
+
+        # Expansion: add one untried move
+        if node.untried:
+            untried = node.untried
+            i = rng.randrange(len(untried))
+            untried[i], untried[-1] = untried[-1], untried[i]
+            cell = untried.pop()
+            mover = self.other[node.player]
+            board.make(Move.of(cell // size, cell % size, mover))
+            depth += 1
+            child = Node(cell, node, mover, candidates(board))
+            node.children.append(child)
+            node = child
+            self.nodes += 1
+
+        # Simulation: random moves to the end of the game
+        winner = self.rollout(node.player)
+        for _ in range(depth):
+            board.unmake()
+        self.playouts += 1
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner is node.player:
+                node.wins += 1.0
+            node = node.parent
+
+    def rollout(self, last: Player) -> Optional[Player]:
+        # Plays random moves until the game ends, then takes them back.
+        # Returns the winner, or None for a draw.
+        board = self.board
+        if board.state == GameState.WIN:
+            return last
+        size = board.size
+        # Sampled straight from the board's free-cell index, which make()
+        # and unmake() keep up to date
+        empty = board.empty
+        rng = self.rng
+        mover = last
+        played = 0
+        # Every rollout move is taken back before returning, so the stone
+        # counts near each cell need no updates along the way
+        radius, board.near_radius = board.near_radius, 0
+        while board.state == GameState.RUNNING and empty:
+            mover = self.other[mover]
+            cell = empty[rng.randrange(len(empty))]
+            board.make(Move.of(cell // size, cell % size, mover))
+            played += 1
+        winner = mover if board.state == GameState.WIN else None
+        for _ in range(played):
+            board.unmake()
+        board.near_radius = radius
+        return winner
+
+    def root_stats(self) -> Dict[int, Tuple[int, float]]:
+        return {child.cell: (child.visits, child.wins) for child in self.root.children}
+
+def search(task: Tuple, stop: Optional[threading.Event] = None) -> Dict[str, object]:
+    # One independent tree; runs in the calling process or in a pool worker
+    size, win_length, moves, symbol, opponent_symbol, playouts, seconds, exploration, seed = task
+    board = Board(size, win_length, near_radius(size))
+    player = Player(symbol, symbol)
+    opponent = Player(opponent_symbol, opponent_symbol)
+    players = {symbol.upper(): player, opponent_symbol.upper(): opponent}
+    for x, y, sym in moves:
+        board.make(Move.of(x, y, players[sym.upper()]))
+    tree = Tree(board, player, opponent, exploration, random.Random(seed))
+    tree.run(playouts, seconds, stop)
+    return {
+        "children": tree.root_stats(),
+        "playouts": tree.playouts,
+        "nodes": tree.nodes,
+        "tree_bytes": tree_bytes(tree.root),
+    }
+
+class MCTS:
+    # best_move() has the same signature as AlphaBeta.best_move(). The
+    # search runs on its own copy of the board; the caller's board is
+    # never touched. Setting `stop` from another thread ends an in-process
+    # search early (best_move() then returns None); pool workers cannot see
+    # it and finish their budget.
+    def __init__(self, size: int = 3, win_length: Optional[int] = None,
+                 playouts: Optional[int] = 10_000, seconds: Optional[float] = None,
+                 workers: int = 1, exploration: float = math.sqrt(2), seed: Optional[int] = None):
+        if playouts is None and seconds is None:
+            raise ValueError("MCTS needs a playout or a time budget")
+        self.size = size
+        self.win_length = win_length or size
+        self.playouts = playouts
+        self.seconds = seconds
+        self.workers = max(1, workers)
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.stats = MCTSStats()
+        self._pool = None
+
+    def best_move(self, board: Board, player: Player, opponent: Optional[Player] = None,
+                  stop: Optional[threading.Event] = None) -> Optional[Tuple[int,int]]:
+        if board.state != GameState.RUNNING:
+            return None
+        if (board.size, board.win_length) != (self.size, self.win_length):
+            raise ValueError("board geometry does not match the engine")
+        opponent = opponent_of(board, player, opponent)
+        moves = [move.getMove() for move, _, _, _ in board.history]
+        if len(moves) != board.n_moves:
+            raise ValueError("MCTS needs a board played through make()")
+
+        start = time.perf_counter()
+        per_worker = None if self.playouts is None else -(-self.playouts // self.workers)
+        tasks = [(self.size, self.win_length, moves, player.getSymbol(), opponent.getSymbol(),
+                  per_worker, self.seconds, self.exploration, self.rng.getrandbits(64))
+                 for _ in range(self.workers)]
+        if self.workers == 1:
+            results = [search(tasks[0], stop)]
+        else:
+            if self._pool is None:
+                self._pool = mp.Pool(self.workers)
+            results = self._pool.map(search, tasks)
+
+        # Root parallelism: sum the root statistics of every tree
+        merged: Dict[int, List[float]] = {}
+        self.stats = MCTSStats()
+        self.stats.workers = self.workers
+        for result in results:
+            self.stats.playouts += result["playouts"]
+            self.stats.nodes += result["nodes"]
+            self.stats.tree_bytes += result["tree_bytes"]
+            for cell, (visits, wins) in result["children"].items():
+                total = merged.setdefault(cell, [0, 0.0])
+                total[0] += visits
+                total[1] += wins
+        self.stats.seconds = time.perf_counter() - start
+        if not merged or (stop is not None and stop.is_set()):
+            return None
+        best = max(merged, key=lambda cell: (merged[cell][0], merged[cell][1]))
+        return divmod(best, self.size)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Time MCTS from the empty board")
+    parser.add_argument("--size", type=int, default=9)
+    parser.add_argument("--win-length", type=int, default=5)
+    parser.add_argument("--playouts", type=int, default=None)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = MCTS(args.size, args.win_length, args.playouts, args.seconds, args.workers, seed=0)
+    move = engine.best_move(Board(args.size, args.win_length), Player("X", "X"), Player("O", "O"))
+    engine.close()
+    stats = engine.stats
+    print(f"move {move}: {stats.playouts} playouts in {stats.seconds:.2f}s "
+          f"({stats.pps():,.0f}/s on {stats.workers} workers), "
+          f"{stats.nodes} nodes, {stats.tree_bytes / 1024:.0f} KiB of tree")
@@ -0,0 +1,242 @@
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from ..Board import Board, GameState
+from ..Move import Move
+from ..Player import Player
+from .Zobrist import Zobrist
+from .TranspositionTable import TranspositionTable, EXACT, LOWER, UPPER
+
+# Scores are from the side to move. A win found at ply p scores
+# WIN_SCORE - p so that faster wins (and slower losses) are preferred.
+WIN_SCORE = 1_000_000
+MATE_BOUND = WIN_SCORE - 10_000
+INFINITY = WIN_SCORE + 1
+
+@lru_cache(maxsize=None)
+def center_order(size: int) -> Tuple[int, ...]:
+    # Central cells take part in more lines, so try them first
+    mid = (size - 1) / 2
+    cells = range(size*size)
+    return tuple(sorted(cells, key=lambda i: ((i // size) - mid)**2 + ((i % size) - mid)**2))
+
+class SearchCancelled(Exception):
+    pass
+
+def to_tt(value: int, ply: int) -> int:
+    if value > MATE_BOUND:
+        return value + ply
+    if value < -MATE_BOUND:
+        return value - ply
+    return value
+
+def from_tt(value: int, ply: int) -> int:
+    if value > MATE_BOUND:
+        return value - ply
+    if value < -MATE_BOUND:
+        return value + ply
+    return value
+
+class SearchStats:
+    def __init__(self):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.seconds = 0.0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_used = 0
+
+    def nps(self) -> float:
+        return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+    def hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "seconds": self.seconds,
+            "nodes_per_second": self.nps(),
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_hit_rate": self.hit_rate(),
+            "tt_used": self.tt_used,
+        }
+
+def opponent_of(board: Board, player: Player, opponent: Optional[Player]) -> Player:
+    # The search plays moves for both sides through board.make(), so it
+    # needs a Player for the opponent; make one up if the caller has none
+    if opponent is not None:
+        return opponent
+    symbol = player.getSymbol().upper()
+    for other in board.bitboards:
+        if other != symbol:
+            return Player(other, other)
+    return Player("O" if symbol == "X" else "X", "Opponent")
+
+class Minimax:
+    # Plain minimax with no pruning or table, kept as the baseline
+    # the other engines are measured against
+    def __init__(self, size: int = 3, win_length: Optional[int] = None):
+        self.size = size
+        self.win_length = win_length or size
+        self.stats = SearchStats()
+
+    def best_move(self, board: Board, player: Player,
+                  opponent: Optional[Player] = None) -> Optional[Tuple[int,int]]:
+        if board.state != GameState.RUNNING:
+            return None
+        opponent = opponent_of(board, player, opponent)
+        self.stats = SearchStats()
+        start = time.perf_counter()
+        best, best_cell = -INFINITY, None
+        # make()/unmake() leave the free-cell index as it was, so it can be
+        # walked while moves are tried
+        for cell in board.empty_cells():
+            board.make(Move.of(*divmod(cell, board.size), player))
+            value = -self._value(board, opponent, player, 1)
+            board.unmake()
+            if value > best:
+                best, best_cell = value, divmod(cell, board.size)
+        self.stats.seconds = time.perf_counter() - start
+        return best_cell
+
+    def _value(self, board: Board, mover: Player, other: Player, ply: int) -> int:
+        # Value for `mover`, who is about to play
+        self.stats.nodes += 1
+        if board.state == GameState.WIN:
+            return -(WIN_SCORE - ply)
+        if board.state == GameState.DRAW:
+            return 0
+        best = -INFINITY
+        for cell in board.empty_cells():
+            board.make(Move.of(*divmod(cell, board.size), mover))
+            value = -self._value(board, other, mover, ply + 1)
+            board.unmake()
+            if value > best:
+                best = value
+        return best
+
+class AlphaBeta:
+    # Negamax with alpha-beta pruning, move ordering (table move first,
+    # then centre-out) and a bounded transposition table. Positions are
+    # keyed by the smallest of their 8 symmetric Zobrist hashes, so all
+    # rotations and reflections of a position share one entry.
+    #
+    # Moves are played and taken back on the caller's board with
+    # make()/unmake(); the board is left as it was found. Setting `stop`
+    # from another thread abandons the search and best_move() returns None.
+    def __init__(self, size: int = 3, win_length: Optional[int] = None,
+                 tt_bits: int = 16, max_depth: Optional[int] = None):
+        self.size = size
+        self.win_length = win_length or size
+        self.n_cells = size * size
+        self.max_depth = max_depth if max_depth is not None else self.n_cells
+        self.order = center_order(size)
+        self.zobrist = Zobrist(size)
+        self.side_toggle = self.zobrist.side_keys[0] ^ self.zobrist.side_keys[1]
+        self.tt = TranspositionTable(tt_bits)
+        self.stats = SearchStats()
+        # Zobrist color per symbol, assigned on first sight
+        self.colors: Dict[str, int] = {}
+        self._root_move = -1
+        self._stop: Optional[threading.Event] = None
+
+    def best_move(self, board: Board, player: Player, opponent: Optional[Player] = None,
+                  stop: Optional[threading.Event] = None) -> Optional[Tuple[int,int]]:
+        if board.state != GameState.RUNNING:
+            return None
+        if (board.size, board.win_length) != (self.size, self.win_length):
+            raise ValueError("board geometry does not match the engine")
+        self._stop = stop
+        opponent = opponent_of(board, player, opponent)
+        symbol = player.getSymbol().upper()
+        color = self.colors.setdefault(symbol, len(self.colors) % 2)
+        me = board.bitboards.get(symbol, 0)
+        opp = board.occupied & ~me
+        stones = (me, opp) if color == 0 else (opp, me)
+
+        self.stats = SearchStats()
+        probes, hits = self.tt.probes, self.tt.hits
+        start = time.perf_counter()
+        self._root_move = -1
+        hashes = self.zobrist.hashes(stones, color)
+        played = len(board.history)
+        try:
+            self._negamax(board, player, opponent, color, hashes, self.max_depth, -INFINITY, INFINITY, 0)
+        except SearchCancelled:
+            while len(board.history) > played:
+                board.unmake()
+            self._root_move = -1
+        self.stats.seconds = time.perf_counter() - start
+        self.stats.tt_probes = self.tt.probes - probes
+        self.stats.tt_hits = self.tt.hits - hits
+        self.stats.tt_used = self.tt.used
+        if self._root_move < 0:
+            return None
+        return divmod(self._root_move, self.size)
+
+    def _negamax(self, board: Board, me: Player, opp: Player, color: int, hashes: List[int],
+                 depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.stats.nodes += 1
+        if self._stop is not None and self.stats.nodes & 1023 == 0 and self._stop.is_set():
+            raise SearchCancelled
+        if board.state == GameState.DRAW or depth == 0:
+            return 0
+
+        key, sym = Zobrist.canonical(hashes)
+        tt_move = -1
+        entry = self.tt.probe(key)
+        if entry is not None:
+            e_depth, e_value, e_flag, e_move = entry
+            if e_move >= 0:
+                tt_move = self.zobrist.inverse[sym][e_move]
+            if e_depth >= depth and ply > 0:
+                value = from_tt(e_value, ply)
+                if e_flag == EXACT:
+                    return value
+                if e_flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        alpha_orig = alpha
+        best, best_move = -INFINITY, -1
+        keys_by_sym = self.zobrist.keys_by_sym
+        size = self.size
+        moves = self.order if tt_move < 0 else (tt_move,) + self.order
+        for cell in moves:
+            if board.occupied >> cell & 1:
+                continue
+            if best_move >= 0 and cell == tt_move:
+                continue
+            board.make(Move.of(cell // size, cell % size, me))
+            if board.state == GameState.WIN:
+                value = WIN_SCORE - (ply + 1)
+            else:
+                toggle = self.side_toggle
+                child = [h ^ keys_by_sym[s][color][cell] ^ toggle for s, h in enumerate(hashes)]
+                value = -self._negamax(board, opp, me, 1 - color, child, depth - 1, -beta, -alpha, ply + 1)
+            board.unmake()
+            if value > best:
+                best, best_move = value, cell
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        self.stats.cutoffs += 1
+                        break
+
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, to_tt(best, ply), flag, self.zobrist.perms[sym][best_move])
+        if ply == 0:
+            self._root_move = best_move
+        return best
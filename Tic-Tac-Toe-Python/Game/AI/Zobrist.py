@@ -0,0 +1,76 @@
+import random
+from functools import lru_cache
+from typing import List, Tuple
+
+# The 8 symmetries of a square board, as functions of (r, c, n)
+SYMMETRIES = (
+    lambda r, c, n: (r, c),              # identity
+    lambda r, c, n: (c, n-1-r),          # rotate 90
+    lambda r, c, n: (n-1-r, n-1-c),      # rotate 180
+    lambda r, c, n: (n-1-c, r),          # rotate 270
+    lambda r, c, n: (r, n-1-c),          # mirror left/right
+    lambda r, c, n: (n-1-r, c),          # mirror top/bottom
+    lambda r, c, n: (c, r),              # transpose
+    lambda r, c, n: (n-1-c, n-1-r),      # anti-transpose
+)
+
+@lru_cache(maxsize=None)
+def symmetry_tables(size: int) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]:
+    # perms[s][cell] is where the cell lands under symmetry s,
+    # inverse[s][cell] maps it back
+    perms = []
+    inverse = []
+    for sym in SYMMETRIES:
+        perm = [0] * (size*size)
+        for r in range(size):
+            for c in range(size):
+                tr, tc = sym(r, c, size)
+                perm[r*size + c] = tr*size + tc
+        inv = [0] * (size*size)
+        for cell, target in enumerate(perm):
+            inv[target] = cell
+        perms.append(tuple(perm))
+        inverse.append(tuple(inv))
+    return tuple(perms), tuple(inverse)
+
+class Zobrist:
+    def __init__(self, size: int, seed: int = 0x5EED):
+        rng = random.Random(seed)
+        self.size = size
+        self.n_cells = size * size
+        # keys[color][cell]; color 0 and 1 are the two players
+        self.keys: List[List[int]] = [
+            [rng.getrandbits(64) for _ in range(self.n_cells)] for _ in range(2)
+        ]
+        self.side_keys: List[int] = [rng.getrandbits(64), rng.getrandbits(64)]
+        self.perms, self.inverse = symmetry_tables(size)
+        # keys_by_sym[s][color][cell] = keys[color][perms[s][cell]], so that a
+        # move updates all 8 symmetric hashes with one lookup each
+        self.keys_by_sym: List[List[List[int]]] = [
+            [[self.keys[color][perm[cell]] for cell in range(self.n_cells)] for color in range(2)]
+            for perm in self.perms
+        ]
+
+    def hashes(self, stones: Tuple[int, int], to_move: int) -> List[int]:
+        # One hash per symmetry for bitboards (color 0, color 1)
+        result = []
+        for sym_keys in self.keys_by_sym:
+            h = self.side_keys[to_move]
+            for color in range(2):
+                bits = stones[color]
+                table = sym_keys[color]
+                cell = 0
+                while bits:
+                    if bits & 1:
+                        h ^= table[cell]
+                    bits >>= 1
+                    cell += 1
+            result.append(h)
+        return result
+
+    @staticmethod
+    def canonical(hashes: List[int]) -> Tuple[int, int]:
+        # The smallest of the symmetric hashes identifies the whole class;
+        # also return which symmetry produced it
+        key = min(hashes)
+        return key, hashes.index(key)
@@ -1,5 +1,7 @@
 from enum import Enum
-from typing import List, Optional, Tuple
+from functools import lru_cache
+import random
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from .Player import Player
 from .Move import Move
 
@@ -8,31 +10,254 @@ class GameState(Enum):
     DRAW = 1
     RUNNING = 2
 
+class BoardEvent(Enum):
+    # CELL: (row, col, symbol), symbol is blank_sym when a move is taken back
+    # STATE: (state, win_line)
+    # RESET: None
+    CELL = 0
+    STATE = 1
+    RESET = 2
+
+BoardListener = Callable[[BoardEvent, object], None]
+
 class Board:
+    __slots__ = ("size", "win_length", "n_cells", "win_line", "last_index", "n_moves", "state",
+                 "blank_sym", "board_matrix", "bitboards", "occupied", "history", "listeners",
+                 "empty", "empty_pos", "near_radius", "near_count", "early_draw", "all_lines",
+                 "touched_lines", "dead_lines", "line_undo", "_blank_row", "_all_cells", "_no_stones_near")
+
     board_matrix: List[List[str]]
     win_line: Optional[List[Tuple[int,int]]]
 
-    def __init__(self):
+    # Line directions: rows, cols, diagonals, anti-diagonals
+    DIRECTIONS: Tuple[Tuple[int,int], ...] = ((0,1), (1,0), (1,1), (1,-1))
+
+    def __init__(self, size: int = 3, win_length: Optional[int] = None, near_radius: int = 0,
+                 early_draw: bool = False):
+        if win_length is None:
+            win_length = size
+        if size < 1 or not 1 <= win_length <= size:
+            raise ValueError(f"invalid board {size}x{size} with win length {win_length}")
+        self.size: int = size
+        self.win_length: int = win_length
+        self.n_cells: int = size * size
         self.win_line: Optional[List[Tuple[int,int]]] = None
+        # Flat index (r*size + c) of the last cell played, -1 before any move
+        self.last_index: int = -1
         self.n_moves: int = 0
         self.state: GameState = GameState.RUNNING
         self.blank_sym: str = ''
-        self.board_matrix: List[List[str]] = [[self.blank_sym]*3 for _ in range(3)]
-        self.WIN_CONDITIONS: List[List[Tuple[int,int]]] = [
-            # rows
-            [(0,0),(0,1),(0,2)], [(1,0),(1,1),(1,2)], [(2,0),(2,1),(2,2)],
-            # cols
-            [(0,0),(1,0),(2,0)], [(0,1),(1,1),(2,1)], [(0,2),(1,2),(2,2)],
-            # diagonals
-            [(0,0),(1,1),(2,2)], [(0,2),(1,1),(2,0)]
-        ]
+        # Compatibility view for the GUI, kept in sync with the bitboards
+        self._blank_row: List[str] = [self.blank_sym]*size
+        self.board_matrix: List[List[str]] = [self._blank_row[:] for _ in range(size)]
+        # One bitboard per player symbol (upper-cased), plus their union.
+        # Bit (r*size + c) is set when cell (r, c) is taken.
+        self.bitboards: Dict[str, int] = {}
+        self.occupied: int = 0
+        # Moves played through make(), with what unmake() needs to restore:
+        # (move, previous last_index, previous state, previous win_line)
+        self.history: List[Tuple[Move, int, GameState, Optional[List[Tuple[int,int]]]]] = []
+        # Called with every change; with no listeners, changes cost nothing extra
+        self.listeners: List[BoardListener] = []
+        # Index of the free cells: `empty` lists their flat indices and
+        # empty_pos[i] is where cell i sits in it. A move swaps the cell
+        # with the last entry and pops it; unmake() reverses exactly that,
+        # so the list is back in its old order and can be iterated while
+        # moves are made and taken back inside the loop.
+        # reset() copies the fresh index back from the shared _all_cells
+        self._all_cells: Tuple[int, ...] = Board.cell_range(self.n_cells)
+        self.empty: List[int] = list(self._all_cells)
+        self.empty_pos: List[int] = list(self._all_cells)
+        # Number of stones within near_radius of each cell; only kept up to
+        # date when a radius is given, since it costs a little on every move
+        self.near_radius: int = near_radius
+        self._no_stones_near: Tuple[int, ...] = (0,) * self.n_cells if near_radius else ()
+        self.near_count: List[int] = list(self._no_stones_near)
+        # Early draw rule: with early_draw the game is drawn as soon as every
+        # winning window holds stones of two players, instead of only when
+        # the board is full. Windows are tracked as bitmasks over
+        # win_lines(): bit i of touched_lines[sym] is set once sym has a
+        # stone in window i, and dead_lines has the windows that two
+        # players have touched. line_undo saves both before each move so
+        # unmake() can restore them. Classic rules (the default) skip this.
+        self.early_draw: bool = early_draw
+        self.all_lines: int = (1 << len(Board.win_lines(size, win_length))) - 1
+        self.touched_lines: Dict[str, int] = {}
+        self.dead_lines: int = 0
+        self.line_undo: List[Tuple[int, int]] = []
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def win_lines(size: int, win_length: int) -> List[List[Tuple[int,int]]]:
+        # Every winning window, grouped by direction in DIRECTIONS order.
+        # Only used for analysis; move-time win detection never lists lines.
+        # Cached, so all boards of one geometry share a single table.
+        lines = []
+        for dr, dc in Board.DIRECTIONS:
+            for r in range(size):
+                for c in range(size):
+                    end_r, end_c = r + dr*(win_length-1), c + dc*(win_length-1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        lines.append([(r + dr*i, c + dc*i) for i in range(win_length)])
+        return lines
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def neighbourhood(size: int, radius: int) -> Tuple[Tuple[int, ...], ...]:
+        # For each cell, the other cells within `radius` rows and columns
+        table = []
+        for index in range(size*size):
+            r, c = divmod(index, size)
+            table.append(tuple(rr*size + cc
+                               for rr in range(max(0, r - radius), min(size, r + radius + 1))
+                               for cc in range(max(0, c - radius), min(size, c + radius + 1))
+                               if (rr, cc) != (r, c)))
+        return tuple(table)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def cell_range(n_cells: int) -> Tuple[int, ...]:
+        # 0 .. n_cells - 1, one tuple shared by all boards with that many cells
+        return tuple(range(n_cells))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def cell_lines(size: int, win_length: int) -> Tuple[int, ...]:
+        # For each cell, a bitmask of the windows in win_lines() through it
+        table = [0] * (size*size)
+        for i, line in enumerate(Board.win_lines(size, win_length)):
+            for r, c in line:
+                table[r*size + c] |= 1 << i
+        return tuple(table)
+
+    def copy(self) -> "Board":
+        # Independent board in the same position, e.g. for a search to play
+        # on; moves are shared (they are immutable), listeners are not
+        clone = Board(self.size, self.win_length, self.near_radius, self.early_draw)
+        for row, src in zip(clone.board_matrix, self.board_matrix):
+            row[:] = src
+        clone.bitboards.update(self.bitboards)
+        clone.occupied = self.occupied
+        clone.history.extend(self.history)
+        clone.n_moves = self.n_moves
+        clone.last_index = self.last_index
+        clone.state = self.state
+        clone.win_line = self.win_line
+        clone.empty[:] = self.empty
+        clone.empty_pos[:] = self.empty_pos
+        clone.near_count[:] = self.near_count
+        clone.touched_lines.update(self.touched_lines)
+        clone.dead_lines = self.dead_lines
+        clone.line_undo.extend(self.line_undo)
+        return clone
+
+    def subscribe(self, listener: BoardListener) -> None:
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener: BoardListener) -> None:
+        self.listeners.remove(listener)
+
+    def emit(self, event: BoardEvent, data: object = None) -> None:
+        for listener in self.listeners:
+            listener(event, data)
+
+    def cell(self, row: int, col: int) -> str:
+        return self.board_matrix[row][col]
+
+    def is_free(self, row: int, col: int) -> bool:
+        return not self.occupied >> (row*self.size + col) & 1
+
+    def empty_cells(self) -> Iterator[int]:
+        # Flat indices of the free cells, straight from the index (no copy)
+        return iter(self.empty)
+
+    def random_empty(self, rng: random.Random = random) -> Optional[Tuple[int,int]]:
+        # A uniformly chosen free cell in O(1), or None on a full board
+        if not self.empty:
+            return None
+        return divmod(self.empty[rng.randrange(len(self.empty))], self.size)
+
+    def near_cells(self) -> List[int]:
+        # Free cells within near_radius of a stone: the moves worth looking
+        # at on a big board. The centre on an empty board; every free cell
+        # when nearness is not tracked or no free cell is near a stone.
+        if not self.near_radius:
+            return list(self.empty)
+        if not self.occupied:
+            return [(self.size // 2) * self.size + self.size // 2]
+        near_count = self.near_count
+        near = [cell for cell in self.empty if near_count[cell]]
+        return near or list(self.empty)
+
+    def _take(self, index: int) -> None:
+        empty = self.empty
+        pos = self.empty_pos[index]
+        last = empty.pop()
+        if last != index:
+            empty[pos] = last
+            self.empty_pos[last] = pos
+        # empty_pos[index] keeps `pos` so _release() can put the cell back
+        if self.near_radius:
+            near_count = self.near_count
+            for cell in Board.neighbourhood(self.size, self.near_radius)[index]:
+                near_count[cell] += 1
+
+    def _release(self, index: int) -> None:
+        # Exact inverse of the last _take()
+        empty = self.empty
+        pos = self.empty_pos[index]
+        if pos == len(empty):
+            empty.append(index)
+        else:
+            moved = empty[pos]
+            self.empty_pos[moved] = len(empty)
+            empty.append(moved)
+            empty[pos] = index
+        if self.near_radius:
+            near_count = self.near_count
+            for cell in Board.neighbourhood(self.size, self.near_radius)[index]:
+                near_count[cell] -= 1
+
+    @property
+    def WIN_CONDITIONS(self) -> List[List[Tuple[int,int]]]:
+        return Board.win_lines(self.size, self.win_length)
+
+    def winnable_lines(self, symbol: str) -> int:
+        # Windows `symbol` could still complete; only tracked with early_draw
+        key = symbol.upper()
+        others = 0
+        for sym, touched in self.touched_lines.items():
+            if sym != key:
+                others |= touched
+        return bin(self.all_lines & ~others).count("1")
+
+    def _claim(self, index: int, key: str) -> None:
+        touched = self.touched_lines
+        mine = touched.get(key, 0)
+        self.line_undo.append((mine, self.dead_lines))
+        lines = Board.cell_lines(self.size, self.win_length)[index]
+        for sym, other in touched.items():
+            if sym != key:
+                self.dead_lines |= lines & other
+        touched[key] = mine | lines
 
     def update_board(self, move: Move) -> None:
         x, y, sym = move.getMove()
-        if self.board_matrix[x][y] == self.blank_sym:
+        index = x*self.size + y
+        bit = 1 << index
+        placed = not self.occupied & bit
+        if placed:
+            key = sym.upper()
+            self.bitboards[key] = self.bitboards.get(key, 0) | bit
+            self.occupied |= bit
             self.board_matrix[x][y] = sym
+            self._take(index)
+            if self.early_draw:
+                self._claim(index, key)
             self.n_moves += 1
+            self.last_index = index
 
+        old_state = self.state
         if self.is_win(move.getPlayer()):
             self.state = GameState.WIN
         elif self.is_draw():
@@ -40,19 +265,105 @@ class Board:
         else:
             self.state = GameState.RUNNING
 
+        if self.listeners:
+            if placed:
+                self.emit(BoardEvent.CELL, (x, y, sym))
+            if self.state != old_state:
+                self.emit(BoardEvent.STATE, (self.state, self.win_line))
+
+    def make(self, move: Move) -> None:
+        x, y, _ = move.getMove()
+        if self.occupied >> (x*self.size + y) & 1:
+            raise ValueError(f"cell ({x}, {y}) is already taken")
+        self.history.append((move, self.last_index, self.state, self.win_line))
+        self.update_board(move)
+
+    def unmake(self) -> Move:
+        # Takes back the last make() by clearing one cell and restoring the
+        # saved counters; nothing else on the board is touched
+        old_state = self.state
+        move, self.last_index, self.state, self.win_line = self.history.pop()
+        x, y, sym = move.getMove()
+        index = x*self.size + y
+        bit = 1 << index
+        key = sym.upper()
+        bits = self.bitboards[key] & ~bit
+        if bits:
+            self.bitboards[key] = bits
+        else:
+            del self.bitboards[key]
+        self.occupied &= ~bit
+        self.board_matrix[x][y] = self.blank_sym
+        self._release(index)
+        if self.early_draw:
+            touched, self.dead_lines = self.line_undo.pop()
+            # Like the bitboards, a symbol with no stones has no entry
+            if touched:
+                self.touched_lines[key] = touched
+            else:
+                del self.touched_lines[key]
+        self.n_moves -= 1
+        if self.listeners:
+            self.emit(BoardEvent.CELL, (x, y, self.blank_sym))
+            if self.state != old_state:
+                self.emit(BoardEvent.STATE, (self.state, self.win_line))
+        return move
+
     def is_win(self, player: Player) -> bool:
-        for line in self.WIN_CONDITIONS:
-            if all(self.board_matrix[r][c].upper() == player.getSymbol().upper() for r,c in line):
-                self.win_line = line
-                return True
+        # A new line can only run through the last cell played, so only the
+        # four directions through it are walked: O(win_length) per call.
+        bits = self.bitboards.get(player.getSymbol().upper(), 0)
         self.win_line = None
-        return False
+        index = self.last_index
+        if index >= 0 and bits >> index & 1:
+            r, c = divmod(index, self.size)
+            self.win_line = self.line_through(bits, r, c)
+        return self.win_line is not None
+
+    def line_through(self, bits: int, r: int, c: int) -> Optional[List[Tuple[int,int]]]:
+        n = self.size
+        for dr, dc in self.DIRECTIONS:
+            # Walk back to the start of the run, then measure it forwards;
+            # the list of cells is only built for an actual win
+            sr, sc = r, c
+            while 0 <= sr-dr < n and 0 <= sc-dc < n and bits >> ((sr-dr)*n + sc-dc) & 1:
+                sr -= dr
+                sc -= dc
+            length = 0
+            er, ec = sr, sc
+            while 0 <= er < n and 0 <= ec < n and bits >> (er*n + ec) & 1:
+                length += 1
+                er += dr
+                ec += dc
+            if length >= self.win_length:
+                return [(sr + dr*i, sc + dc*i) for i in range(length)]
+        return None
 
     def is_draw(self) -> bool:
-        return self.n_moves == 9 and self.win_line is None
+        # n_moves is kept equal to the popcount of `occupied`. Under the
+        # early draw rule, a board where no window is live is drawn too.
+        if self.win_line is not None:
+            return False
+        return self.n_moves == self.n_cells or (self.early_draw and self.dead_lines == self.all_lines)
 
     def reset(self) -> None:
-        self.board_matrix = [[self.blank_sym]*3 for _ in range(3)]
+        # Cleared in place from prebuilt tuples, so a reset builds no
+        # temporary lists or ranges
+        for row in self.board_matrix:
+            row[:] = self._blank_row
+        self.bitboards.clear()
+        self.history.clear()
+        self.empty[:] = self._all_cells
+        self.empty_pos[:] = self._all_cells
+        if self.near_radius:
+            self.near_count[:] = self._no_stones_near
+        self.touched_lines.clear()
+        self.dead_lines = 0
+        self.line_undo.clear()
+        self.occupied = 0
         self.n_moves = 0
+        self.last_index = -1
         self.win_line = None
         self.state = GameState.RUNNING
+        if self.listeners:
+            self.emit(BoardEvent.RESET)
@@ -1,13 +1,24 @@
 from .Player import Player
 class Move:
+    __slots__ = ("x", "y", "player", "_move")
+
     def __init__(self, x, y, player: Player):
         self.x = x
         self.y = y
         self.player = player
-        pass
+        self._move = (x, y, player.getSymbol())
+
+    @classmethod
+    def of(cls, x, y, player: Player) -> "Move":
+        # Moves are never mutated, so each (cell, player) can share one.
+        # The cache lives on the player and goes away with it.
+        move = player.moves.get((x, y))
+        if move is None:
+            move = player.moves[(x, y)] = cls(x, y, player)
+        return move
 
     def getMove(self):
-        return (self.x, self.y, self.player.getSymbol())
-    
+        return self._move
+
     def getPlayer(self):
         return self.player
@@ -1,8 +1,25 @@
 class Player:
+    __slots__ = ("name", "symbol", "moves")
+
     def __init__(self, symbol, name):
         self.name = name
         self.symbol = symbol
+        # Flyweight Move objects for this player, filled by Move.of
+        self.moves = {}
     def getSymbol(self):
         return self.symbol
     def getName(self):
         return self.name
+    def chooseMove(self, board):
+        # A human's moves come from the UI, not from the player
+        return None
+
+class ComputerPlayer(Player):
+    __slots__ = ("strategy",)
+
+    def __init__(self, symbol, name, strategy):
+        super().__init__(symbol, name)
+        # Any Strategy from Game/Strategies.py: (board, player) -> (row, col)
+        self.strategy = strategy
+    def chooseMove(self, board):
+        return self.strategy(board, self)
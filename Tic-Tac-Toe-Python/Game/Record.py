@@ -0,0 +1,253 @@
+import mmap
+import os
+import struct
+import time
+from typing import Iterator, List, Optional, Sequence, Tuple
+from .Board import Board, GameState
+from .Move import Move
+from .Player import Player
+
+# Append-only binary archive of finished games.
+#
+# The file starts with a HEADER, then fixed-size records, so record i sits
+# at HEADER.size + i * record_size and can be read without an index:
+#
+#   u32  timestamp (Unix seconds)
+#   u8   bit 0: first player (0 = X, 1 = O); bits 1-2: result
+#   u8   number of moves (u16 on boards with more than 255 cells)
+#   ...  the cells played, in order, packed at 4, 8 or 16 bits per cell
+#
+# A 3x3 game takes 11 bytes. The header's rule flags say which rules the
+# games were played under, so replay() rebuilds them on the same board;
+# files written before the flags existed have 0 there, the classic rules.
+
+MAGIC = b"TTTR"
+VERSION = 1
+# magic, version, size, win_length, cell_bits, record_size, rule flags
+HEADER = struct.Struct("<4sBBBBHBx")
+STAMP = struct.Struct("<IB")
+
+# Rule flags
+EARLY_DRAW = 1
+
+X_WIN = 0
+O_WIN = 1
+DRAW = 2
+UNFINISHED = 3
+
+SYMBOLS = ("X", "O")
+
+def cell_bits_for(n_cells: int) -> int:
+    if n_cells <= 16:
+        return 4
+    if n_cells <= 256:
+        return 8
+    return 16
+
+class RecordLayout:
+    __slots__ = ("size", "win_length", "early_draw", "n_cells", "cell_bits", "count_size", "moves_size",
+                 "record_size")
+
+    def __init__(self, size: int, win_length: int, early_draw: bool = False):
+        self.size = size
+        self.win_length = win_length
+        self.early_draw = early_draw
+        self.n_cells = size * size
+        self.cell_bits = cell_bits_for(self.n_cells)
+        self.count_size = 1 if self.n_cells <= 255 else 2
+        self.moves_size = (self.n_cells * self.cell_bits + 7) // 8
+        self.record_size = STAMP.size + self.count_size + self.moves_size
+
+    def header(self) -> bytes:
+        flags = EARLY_DRAW if self.early_draw else 0
+        return HEADER.pack(MAGIC, VERSION, self.size, self.win_length, self.cell_bits, self.record_size, flags)
+
+    def pack(self, cells: Sequence[int], first: int, result: int, timestamp: int) -> bytes:
+        out = bytearray(self.record_size)
+        STAMP.pack_into(out, 0, timestamp & 0xFFFFFFFF, (first & 1) | (result << 1))
+        offset = STAMP.size
+        out[offset:offset + self.count_size] = len(cells).to_bytes(self.count_size, "little")
+        offset += self.count_size
+        if self.cell_bits == 4:
+            for i, cell in enumerate(cells):
+                out[offset + (i >> 1)] |= cell << (4 * (i & 1))
+        else:
+            width = self.cell_bits // 8
+            for i, cell in enumerate(cells):
+                out[offset + i*width:offset + (i+1)*width] = cell.to_bytes(width, "little")
+        return bytes(out)
+
+    def unpack(self, data, offset: int = 0) -> "GameRecord":
+        timestamp, meta = STAMP.unpack_from(data, offset)
+        offset += STAMP.size
+        count = int.from_bytes(data[offset:offset + self.count_size], "little")
+        offset += self.count_size
+        if self.cell_bits == 4:
+            cells = tuple((data[offset + (i >> 1)] >> (4 * (i & 1))) & 0x0F for i in range(count))
+        else:
+            width = self.cell_bits // 8
+            cells = tuple(int.from_bytes(data[offset + i*width:offset + (i+1)*width], "little")
+                          for i in range(count))
+        return GameRecord(cells, meta & 1, (meta >> 1) & 3, timestamp)
+
+class GameRecord:
+    __slots__ = ("cells", "first", "result", "timestamp")
+
+    def __init__(self, cells: Tuple[int, ...], first: int, result: int, timestamp: int):
+        self.cells = cells
+        self.first = first
+        self.result = result
+        self.timestamp = timestamp
+
+    def __repr__(self) -> str:
+        return (f"GameRecord(cells={self.cells}, first={SYMBOLS[self.first]}, "
+                f"result={self.result}, timestamp={self.timestamp})")
+
+def board_record(board: Board) -> Tuple[List[int], int, int]:
+    # (cells, first, result) for a board played through make()
+    cells = []
+    first = 0
+    for i, (move, _, _, _) in enumerate(board.history):
+        x, y, sym = move.getMove()
+        cells.append(x*board.size + y)
+        if i == 0:
+            first = 1 if sym.upper() == "O" else 0
+    if board.state == GameState.WIN:
+        last_symbol = board.history[-1][0].getMove()[2].upper()
+        result = O_WIN if last_symbol == "O" else X_WIN
+    elif board.state == GameState.DRAW:
+        result = DRAW
+    else:
+        result = UNFINISHED
+    return cells, first, result
+
+class RecordWriter:
+    # Buffers packed records in memory and appends them in batches
+    def __init__(self, path: str, size: int = 3, win_length: Optional[int] = None,
+                 batch_size: int = 4096, early_draw: bool = False):
+        self.layout = RecordLayout(size, win_length or size, early_draw)
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer = bytearray()
+        self.pending = 0
+        self.written = 0
+        if os.path.exists(path):
+            # Drop a torn final record left by a crash mid-write
+            record_size = self.layout.record_size
+            excess = (os.path.getsize(path) - HEADER.size) % record_size
+            if os.path.getsize(path) > HEADER.size and excess:
+                os.truncate(path, os.path.getsize(path) - excess)
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(self.layout.header())
+        else:
+            with open(path, "rb") as f:
+                existing = f.read(HEADER.size)
+            if existing != self.layout.header():
+                self.file.close()
+                raise ValueError(f"{path} holds records for a different board or rules")
+
+    def append(self, cells: Sequence[int], first: int, result: int,
+               timestamp: Optional[int] = None) -> None:
+        if timestamp is None:
+            timestamp = int(time.time())
+        self.append_raw(self.layout.pack(cells, first, result, timestamp))
+
+    def append_board(self, board: Board, timestamp: Optional[int] = None) -> None:
+        cells, first, result = board_record(board)
+        self.append(cells, first, result, timestamp)
+
+    def append_raw(self, records: bytes) -> None:
+        # Already packed records, e.g. streamed back from worker processes
+        if len(records) % self.layout.record_size:
+            raise ValueError("partial record")
+        self.buffer += records
+        self.pending += len(records) // self.layout.record_size
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.written += self.pending
+            self.buffer.clear()
+            self.pending = 0
+        self.file.flush()
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+class RecordReader:
+    # Memory-maps an archive; records are decoded only when accessed
+    def __init__(self, path: str):
+        self.path = path
+        self.data: Optional[mmap.mmap] = None
+        self.file = open(path, "rb")
+        if os.fstat(self.file.fileno()).st_size < HEADER.size:
+            self.file.close()
+            raise ValueError(f"{path} is not a game record file")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, win_length, cell_bits, record_size, flags = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a game record file")
+        if flags & ~EARLY_DRAW:
+            self.close()
+            raise ValueError(f"{path} uses rules this version does not know")
+        self.layout = RecordLayout(size, win_length, bool(flags & EARLY_DRAW))
+        if (cell_bits, record_size) != (self.layout.cell_bits, self.layout.record_size):
+            self.close()
+            raise ValueError(f"{path} has an unsupported record layout")
+        # A torn final record (crash mid-write) is ignored
+        self.count = (len(self.data) - HEADER.size) // record_size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> GameRecord:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("record index out of range")
+        return self.layout.unpack(self.data, HEADER.size + index * self.layout.record_size)
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        unpack = self.layout.unpack
+        step = self.layout.record_size
+        for offset in range(HEADER.size, HEADER.size + self.count * step, step):
+            yield unpack(self.data, offset)
+
+    def replay(self, index: int, board: Optional[Board] = None) -> Board:
+        record = self[index]
+        layout = self.layout
+        if board is None:
+            board = Board(layout.size, layout.win_length, early_draw=layout.early_draw)
+        elif (board.size, board.win_length, board.early_draw) != (layout.size, layout.win_length, layout.early_draw):
+            raise ValueError("the board does not match the recorded board and rules")
+        else:
+            board.reset()
+        players = (Player("X", "Player X"), Player("O", "Player O"))
+        turn = record.first
+        for cell in record.cells:
+            board.make(Move.of(cell // board.size, cell % board.size, players[turn]))
+            turn ^= 1
+        return board
+
+    def close(self) -> None:
+        if self.data is not None and not self.data.closed:
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self) -> "RecordReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,311 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Persistent game statistics in a local SQLite file.
+#
+# record_game() only puts an event on a queue; a background thread drains
+# the queue and writes whole batches in one transaction, so callers on the
+# UI thread never wait for the disk. Opening the file and creating the
+# schema happen on that thread too, and reads go through the same queue:
+# they return a Future that the thread completes once every event queued
+# before the read is written, so the caller polls it instead of blocking
+# and still sees all recorded games. Running totals per variant and per
+# player are updated incrementally as events are written, and every game
+# is also kept per player in a table ordered by (player, variant, game),
+# so "last N games" queries are an index range scan.
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".tictactoe", "stats.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    variant TEXT NOT NULL,
+    x_name TEXT NOT NULL,
+    o_name TEXT NOT NULL,
+    winner TEXT,
+    moves INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_variant ON games (variant, id);
+CREATE TABLE IF NOT EXISTS player_games (
+    player TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    game_id INTEGER NOT NULL,
+    outcome INTEGER NOT NULL,  -- 1 win, 0 draw, -1 loss
+    PRIMARY KEY (player, variant, game_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS variant_totals (
+    variant TEXT PRIMARY KEY,
+    total_games INTEGER NOT NULL,
+    x_wins INTEGER NOT NULL,
+    o_wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    win_streak INTEGER NOT NULL,
+    max_win_streak INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player_totals (
+    player TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    streak INTEGER NOT NULL,
+    best_streak INTEGER NOT NULL,
+    PRIMARY KEY (player, variant)
+);
+"""
+
+VARIANT_FIELDS = ("total_games", "x_wins", "o_wins", "draws", "win_streak", "max_win_streak")
+PLAYER_FIELDS = ("games", "wins", "losses", "draws", "streak", "best_streak")
+
+def variant_name(size: int, win_length: int) -> str:
+    return f"{size}x{size}k{win_length}"
+
+def new_totals() -> Dict[str, int]:
+    return {field: 0 for field in VARIANT_FIELDS}
+
+def update_totals(totals: Dict[str, int], winner: Optional[str]) -> None:
+    # Applies one result to variant totals. win_streak counts consecutive
+    # X wins as positive and O wins as negative; draws leave it alone.
+    totals["total_games"] += 1
+    if winner == "X":
+        totals["x_wins"] += 1
+        totals["win_streak"] = totals["win_streak"] + 1 if totals["win_streak"] >= 0 else 1
+    elif winner == "O":
+        totals["o_wins"] += 1
+        totals["win_streak"] = totals["win_streak"] - 1 if totals["win_streak"] <= 0 else -1
+    else:
+        totals["draws"] += 1
+    totals["max_win_streak"] = max(totals["max_win_streak"], abs(totals["win_streak"]))
+
+def win_rate(totals: Dict[str, int]) -> float:
+    # Share of games that had a winner, in percent
+    games = totals["total_games"]
+    return (totals["x_wins"] + totals["o_wins"]) / games * 100 if games else 0.0
+
+class GameEvent:
+    __slots__ = ("ts", "variant", "x_name", "o_name", "winner", "moves")
+
+    def __init__(self, variant: str, x_name: str, o_name: str, winner: Optional[str], moves: int,
+                 ts: Optional[float] = None):
+        self.ts = time.time() if ts is None else ts
+        self.variant = variant
+        self.x_name = x_name
+        self.o_name = o_name
+        self.winner = winner
+        self.moves = moves
+
+# A read run on the writer thread, and the Future for its result
+Query = Tuple[Callable[[sqlite3.Connection], object], Future]
+
+class StatsStore:
+    def __init__(self, path: str = DEFAULT_PATH, flush_interval: float = 1.0, batch_size: int = 256):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.events: "queue.Queue[Union[GameEvent, Query, None]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="stats-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        # WAL lets other processes read while a batch is written
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # -------------------
+    # Writing
+    # -------------------
+
+    def record_game(self, event: GameEvent) -> None:
+        self.events.put(event)
+
+    def close(self) -> None:
+        # Writes everything still queued, then stops the writer thread
+        if self._thread.is_alive():
+            self.events.put(None)
+            self._thread.join()
+
+    def _open(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _writer(self) -> None:
+        try:
+            conn = self._open()
+        except (OSError, sqlite3.Error) as e:
+            self._fail(e)
+            return
+        try:
+            running = True
+            while running:
+                item = self.events.get()
+                if item is None:
+                    break
+                if isinstance(item, tuple):
+                    self._answer(conn, item)
+                    continue
+                batch = [item]
+                query = None
+                # Collect whatever else arrives within the flush interval;
+                # a read ends the batch so it sees everything before it
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = self.events.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        running = False
+                        break
+                    if isinstance(item, tuple):
+                        query = item
+                        break
+                    batch.append(item)
+                try:
+                    self._write_batch(conn, batch)
+                except Exception as e:
+                    # The batch is rolled back and the store stops writing;
+                    # reads fail with the error instead of waiting forever
+                    if query is not None:
+                        self._reject(query, e)
+                    if running:
+                        self._fail(e)
+                    return
+                if query is not None:
+                    self._answer(conn, query)
+        finally:
+            conn.close()
+
+    def _answer(self, conn: sqlite3.Connection, query: Query) -> None:
+        read, future = query
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(read(conn))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _reject(self, query: Query, error: Exception) -> None:
+        future = query[1]
+        if future.set_running_or_notify_cancel():
+            future.set_exception(error)
+
+    def _fail(self, error: Exception) -> None:
+        # The file could not be opened or written: until close(), events are
+        # dropped and reads fail with the error
+        while True:
+            item = self.events.get()
+            if item is None:
+                return
+            if isinstance(item, tuple):
+                self._reject(item, error)
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[GameEvent]) -> None:
+        variants: Dict[str, Dict[str, int]] = {}
+        players: Dict[Tuple[str, str], Dict[str, int]] = {}
+        with conn:
+            for event in batch:
+                cursor = conn.execute(
+                    "INSERT INTO games (ts, variant, x_name, o_name, winner, moves) VALUES (?, ?, ?, ?, ?, ?)",
+                    (event.ts, event.variant, event.x_name, event.o_name, event.winner, event.moves),
+                )
+                game_id = cursor.lastrowid
+
+                totals = variants.get(event.variant)
+                if totals is None:
+                    totals = variants[event.variant] = self._variant_totals(conn, event.variant)
+                update_totals(totals, event.winner)
+
+                for name, symbol in ((event.x_name, "X"), (event.o_name, "O")):
+                    outcome = 0 if event.winner is None else (1 if event.winner == symbol else -1)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO player_games (player, variant, game_id, outcome) VALUES (?, ?, ?, ?)",
+                        (name, event.variant, game_id, outcome),
+                    )
+                    key = (name, event.variant)
+                    ptotals = players.get(key)
+                    if ptotals is None:
+                        ptotals = players[key] = self._player_totals(conn, name, event.variant)
+                    ptotals["games"] += 1
+                    if outcome > 0:
+                        ptotals["wins"] += 1
+                        ptotals["streak"] += 1
+                        ptotals["best_streak"] = max(ptotals["best_streak"], ptotals["streak"])
+                    else:
+                        ptotals["losses" if outcome < 0 else "draws"] += 1
+                        ptotals["streak"] = 0
+
+            for variant, totals in variants.items():
+                conn.execute(
+                    f"INSERT OR REPLACE INTO variant_totals (variant, {', '.join(VARIANT_FIELDS)}) "
+                    f"VALUES (?, {', '.join('?' * len(VARIANT_FIELDS))})",
+                    (variant, *(totals[f] for f in VARIANT_FIELDS)),
+                )
+            for (name, variant), ptotals in players.items():
+                conn.execute(
+                    f"INSERT OR REPLACE INTO player_totals (player, variant, {', '.join(PLAYER_FIELDS)}) "
+                    f"VALUES (?, ?, {', '.join('?' * len(PLAYER_FIELDS))})",
+                    (name, variant, *(ptotals[f] for f in PLAYER_FIELDS)),
+                )
+
+    # -------------------
+    # Reading
+    # -------------------
+
+    def _variant_totals(self, conn: sqlite3.Connection, variant: str) -> Dict[str, int]:
+        row = conn.execute(
+            f"SELECT {', '.join(VARIANT_FIELDS)} FROM variant_totals WHERE variant = ?", (variant,)
+        ).fetchone()
+        return dict(zip(VARIANT_FIELDS, row)) if row else new_totals()
+
+    def _player_totals(self, conn: sqlite3.Connection, player: str, variant: str) -> Dict[str, int]:
+        row = conn.execute(
+            f"SELECT {', '.join(PLAYER_FIELDS)} FROM player_totals WHERE player = ? AND variant = ?",
+            (player, variant),
+        ).fetchone()
+        return dict(zip(PLAYER_FIELDS, row)) if row else {field: 0 for field in PLAYER_FIELDS}
+
+    def _recent_win_rate(self, conn: sqlite3.Connection, player: str, variant: str,
+                         last_n: int) -> Tuple[int, float]:
+        row = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(outcome = 1), 0) FROM ("
+            " SELECT outcome FROM player_games WHERE player = ? AND variant = ?"
+            " ORDER BY game_id DESC LIMIT ?)",
+            (player, variant, last_n),
+        ).fetchone()
+        games, wins = row
+        return games, (wins / games * 100 if games else 0.0)
+
+    def submit(self, read: Callable[[sqlite3.Connection], object]) -> Future:
+        # Runs `read` on the writer thread once the events queued so far
+        # are written; poll or wait on the returned Future for its result
+        future: Future = Future()
+        self.events.put((read, future))
+        return future
+
+    def variant_totals(self, variant: str) -> Future:
+        return self.submit(lambda conn: self._variant_totals(conn, variant))
+
+    def player_totals(self, player: str, variant: str) -> Future:
+        return self.submit(lambda conn: self._player_totals(conn, player, variant))
+
+    def recent_win_rates(self, players: Sequence[str], variant: str, last_n: int) -> Future:
+        # [(games considered, win percentage)] over each player's last N games
+        players = list(players)
+        return self.submit(lambda conn: [self._recent_win_rate(conn, player, variant, last_n)
+                                         for player in players])
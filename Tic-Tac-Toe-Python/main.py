@@ -1,6 +1,72 @@
 
-from GUI.App.App import TicTacToeApp
+import time
+START = time.perf_counter()
 
-if __name__ == "__main__":
+import argparse
+import sys
+
+# The GUI is only imported when it is actually started, so --headless runs
+# load nothing but the Game package and work without a display.
+# --timing prints where startup time went; for a per-module breakdown run
+# `python -X importtime main.py --headless ...`.
+# --metrics turns on Game/Metrics.py and writes a snapshot when the game ends.
+
+def report(label: str, imported: float, ready: float) -> None:
+    print(f"[timing] {label}: imports {(imported - START) * 1000:.1f} ms, "
+          f"ready {(ready - START) * 1000:.1f} ms after start "
+          f"({time.process_time() * 1000:.1f} ms CPU in this process)", file=sys.stderr)
+
+def start_metrics(path: str) -> None:
+    import atexit
+    from Game import Metrics
+    Metrics.import_targets()
+    Metrics.enable()
+    atexit.register(Metrics.METRICS.write, path)
+
+def run_gui(args: argparse.Namespace) -> None:
+    from GUI.App.App import TicTacToeApp
+    imported = time.perf_counter()
+    if args.metrics:
+        start_metrics(args.metrics)
     app = TicTacToeApp()
+    if args.timing:
+        app.update_idletasks()
+        report("gui", imported, time.perf_counter())
     app.mainloop()
+
+def run_headless(args: argparse.Namespace) -> None:
+    from CLI.Console import ConsoleGame
+    from Game.Strategies import make_strategy
+    imported = time.perf_counter()
+    if args.metrics:
+        start_metrics(args.metrics)
+    try:
+        strategies = tuple(
+            None if name == "human" else make_strategy(name, size=args.size, win_length=args.win_length)
+            for name in (args.x, args.o)
+        )
+        game = ConsoleGame(args.size, args.win_length, strategies)
+    except ValueError as e:
+        sys.exit(f"error: {e}")
+    if args.timing:
+        report("headless", imported, time.perf_counter())
+    game.play(first=1 if args.o_first else 0)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tic-Tac-Toe")
+    parser.add_argument("--headless", action="store_true", help="play in the terminal without loading Tk")
+    parser.add_argument("--size", type=int, default=3, help="board size (headless only)")
+    parser.add_argument("--win-length", type=int, default=None, help="stones in a row to win (headless only)")
+    parser.add_argument("--x", default="human", help="human or a strategy name (headless only)")
+    parser.add_argument("--o", default="human", help="human or a strategy name (headless only)")
+    parser.add_argument("--o-first", action="store_true", help="O moves first (headless only)")
+    parser.add_argument("--timing", action="store_true", help="report import and startup time")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="record latency histograms and counters; written on exit as JSON, "
+                             "or Prometheus text for .prom/.txt")
+    args = parser.parse_args()
+
+    if args.headless:
+        run_headless(args)
+    else:
+        run_gui(args)
@@ -0,0 +1,320 @@
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import signal
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from Game.Board import Board, GameState
+from Game.Move import Move
+from Game.Player import ComputerPlayer
+from Game.Strategies import STRATEGIES, make_strategy
+
+# Tournaments between registered strategies (Game/Strategies.py).
+#
+# Every pairing is a mini-match of --games-per-pair games in which the two
+# bots take turns moving first. Matches are cut into tasks of at most
+# --chunk-size games and spread over a process pool; each task returns one
+# byte per game, and the parent applies them to the standings and to the
+# Elo ratings in task order, however the workers finish. Task seeds depend
+# only on --seed and the task, and Elo depends on the order games are
+# applied in, so with both fixed results do not depend on the number of
+# workers. The one exception: each worker builds its bots once and keeps
+# them, so a depth-limited alphabeta (boards above 3x3) also keeps its
+# transposition table from earlier tasks, and can pick different moves
+# depending on which tasks its worker played first.
+#
+# With --checkpoint, progress is saved every few seconds and on exit; run
+# the same command again to continue where it stopped.
+
+# Outcome bytes, from the first-named bot's side
+LOSS = 0
+DRAW = 1
+WIN = 2
+
+# -------------------
+# Playing
+# -------------------
+
+def play_game(board: Board, first: ComputerPlayer, second: ComputerPlayer) -> Optional[ComputerPlayer]:
+    # Returns the winner, or None for a draw
+    board.reset()
+    player, other = first, second
+    while board.state == GameState.RUNNING:
+        cell = player.chooseMove(board)
+        if cell is None:
+            break
+        board.make(Move.of(cell[0], cell[1], player))
+        if board.state == GameState.RUNNING:
+            player, other = other, player
+    return player if board.state == GameState.WIN else None
+
+# Per-process bots by (strategy, size, win_length), built on first use and
+# kept for later tasks; they all draw from _rng, which each task reseeds
+_bots: Dict[Tuple[str, int, Optional[int]], Tuple[ComputerPlayer, ComputerPlayer]] = {}
+_rng = random.Random()
+
+def bots_for(name: str, size: int, win_length: Optional[int]) -> Tuple[ComputerPlayer, ComputerPlayer]:
+    key = (name, size, win_length)
+    bots = _bots.get(key)
+    if bots is None:
+        # The same strategy plays both symbols, so its state (e.g. a
+        # transposition table) carries across games and tasks
+        strategy = make_strategy(name, _rng, size, win_length)
+        bots = _bots[key] = (ComputerPlayer("X", name, strategy), ComputerPlayer("O", name, strategy))
+    return bots
+
+def init_worker() -> None:
+    # Ctrl-C is handled by the parent, which saves and stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def run_task(task: Tuple[str, str, str, int, int, int, Optional[int], int, bool]) -> Tuple[str, str, str, bytes]:
+    task_id, a, b, offset, n_games, size, win_length, seed, early_draw = task
+    _rng.seed(f"{seed}/{task_id}")
+    bots = {name: bots_for(name, size, win_length) for name in (a, b)}
+    board = Board(size, win_length, early_draw=early_draw)
+    outcomes = bytearray()
+    for game in range(offset, offset + n_games):
+        # `a` moves first in even games, `b` in odd ones
+        first, second = (a, b) if game % 2 == 0 else (b, a)
+        winner = play_game(board, bots[first][0], bots[second][1])
+        if winner is None:
+            outcomes.append(DRAW)
+        else:
+            outcomes.append(WIN if winner.getName() == a else LOSS)
+    return task_id, a, b, bytes(outcomes)
+
+# -------------------
+# Standings
+# -------------------
+
+class Standings:
+    def __init__(self, entrants: List[str], k_factor: float = 16.0, initial: float = 1500.0):
+        self.k_factor = k_factor
+        self.elo: Dict[str, float] = {name: initial for name in entrants}
+        self.record: Dict[str, Dict[str, float]] = {
+            name: {"games": 0, "wins": 0, "draws": 0, "losses": 0, "points": 0.0} for name in entrants
+        }
+
+    def add(self, a: str, b: str, outcomes: bytes) -> None:
+        # Elo is updated game by game, in the order the games were played
+        k = self.k_factor
+        ra, rb = self.elo[a], self.elo[b]
+        rec_a, rec_b = self.record[a], self.record[b]
+        for outcome in outcomes:
+            score = outcome / 2
+            expected = 1 / (1 + 10 ** ((rb - ra) / 400))
+            ra += k * (score - expected)
+            rb -= k * (score - expected)
+            for rec, result in ((rec_a, outcome), (rec_b, 2 - outcome)):
+                rec["games"] += 1
+                rec["points"] += result / 2
+                rec["wins" if result == WIN else "draws" if result == DRAW else "losses"] += 1
+        self.elo[a], self.elo[b] = ra, rb
+
+    def ranking(self) -> List[str]:
+        return sorted(self.elo, key=lambda name: (-self.record[name]["points"], -self.elo[name], name))
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"elo": self.elo, "record": self.record}
+
+    def load(self, data: Dict[str, object]) -> None:
+        self.elo.update(data["elo"])
+        self.record.update(data["record"])
+
+# -------------------
+# Pairings
+# -------------------
+
+def match_tasks(prefix: str, a: str, b: str, games: int, chunk_size: int) -> Iterator[Tuple[str, str, str, int, int]]:
+    for offset in range(0, games, chunk_size):
+        n = min(chunk_size, games - offset)
+        yield f"{prefix}{a}|{b}|{offset}", a, b, offset, n
+
+def round_robin(entrants: List[str]) -> List[Tuple[str, str]]:
+    return [(a, b) for i, a in enumerate(entrants) for b in entrants[i + 1:]]
+
+def swiss_pairings(standings: Standings, played: Set[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    # Pairs neighbours in the ranking, skipping rematches where possible.
+    # With an odd field the lowest-ranked unpaired bot sits the round out.
+    waiting = standings.ranking()
+    pairs = []
+    while len(waiting) > 1:
+        a = waiting.pop(0)
+        partner = next((b for b in waiting if tuple(sorted((a, b))) not in played), waiting[0])
+        waiting.remove(partner)
+        pairs.append((a, partner))
+    return pairs
+
+# -------------------
+# Running
+# -------------------
+
+class Tournament:
+    def __init__(self, config: Dict[str, object], checkpoint: Optional[str] = None):
+        self.config = config
+        self.entrants: List[str] = config["entrants"]
+        self.standings = Standings(self.entrants, config["k_factor"])
+        self.done: Set[str] = set()
+        self.played: Set[Tuple[str, str]] = set()
+        self.round = 0
+        self.pairings: List[Tuple[str, str]] = []
+        self.games = 0
+        self.checkpoint = checkpoint
+        self.last_save = time.monotonic()
+        if checkpoint and os.path.exists(checkpoint):
+            self.load(checkpoint)
+
+    def load(self, path: str) -> None:
+        with open(path) as f:
+            data = json.load(f)
+        if data["config"] != self.config:
+            raise ValueError(f"{path} was written for a different tournament")
+        self.standings.load(data["standings"])
+        self.done = set(data["done"])
+        self.played = {tuple(pair) for pair in data["played"]}
+        self.round = data["round"]
+        self.pairings = [tuple(pair) for pair in data["pairings"]]
+        self.games = data["games"]
+
+    def save(self) -> None:
+        if not self.checkpoint:
+            return
+        data = {
+            "config": self.config,
+            "standings": self.standings.as_dict(),
+            "done": sorted(self.done),
+            "played": sorted(self.played),
+            "round": self.round,
+            "pairings": self.pairings,
+            "games": self.games,
+        }
+        tmp = f"{self.checkpoint}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.checkpoint)
+        self.last_save = time.monotonic()
+
+    def tasks(self, prefix: str, pairs: List[Tuple[str, str]]) -> List[Tuple]:
+        config = self.config
+        out = []
+        for a, b in pairs:
+            for task_id, ta, tb, offset, n in match_tasks(prefix, a, b, config["games_per_pair"], config["chunk_size"]):
+                if task_id not in self.done:
+                    out.append((task_id, ta, tb, offset, n, config["size"], config["win_length"], config["seed"],
+                                config["early_draw"]))
+        return out
+
+    def play(self, pool, tasks: List[Tuple], progress: bool) -> None:
+        # imap hands results back in task order, so Elo is updated in the
+        # same order as with a single process; a slow task only holds back
+        # the ones queued after it
+        results = pool.imap(run_task, tasks) if pool is not None else map(run_task, tasks)
+        start = time.perf_counter()
+        played = 0
+        for task_id, a, b, outcomes in results:
+            self.standings.add(a, b, outcomes)
+            self.done.add(task_id)
+            self.games += len(outcomes)
+            played += len(outcomes)
+            if time.monotonic() - self.last_save > 5:
+                self.save()
+            if progress:
+                elapsed = time.perf_counter() - start
+                print(f"{self.games} games, {played / max(elapsed, 1e-9):,.0f} games/s", flush=True)
+
+    def run(self, workers: int, progress: bool = True) -> None:
+        pool = mp.Pool(workers, initializer=init_worker) if workers > 1 else None
+        try:
+            if self.config["format"] == "roundrobin":
+                self.play(pool, self.tasks("", round_robin(self.entrants)), progress)
+            else:
+                while self.round < self.config["rounds"]:
+                    if not self.pairings:
+                        self.pairings = swiss_pairings(self.standings, self.played)
+                        self.save()
+                    self.play(pool, self.tasks(f"r{self.round}|", self.pairings), progress)
+                    self.played.update(tuple(sorted(pair)) for pair in self.pairings)
+                    self.round += 1
+                    self.pairings = []
+                    if progress:
+                        print(f"round {self.round}/{self.config['rounds']} done", flush=True)
+        finally:
+            # Save before stopping the pool, so a second interrupt while the
+            # workers shut down cannot lose the progress
+            self.save()
+            if pool is not None:
+                pool.terminate()
+
+    def report(self) -> None:
+        print(f"{'#':>3} {'bot':<16} {'elo':>7} {'points':>9} {'games':>8} {'W':>7} {'D':>7} {'L':>7}")
+        for rank, name in enumerate(self.standings.ranking(), 1):
+            rec = self.standings.record[name]
+            print(f"{rank:>3} {name:<16} {self.standings.elo[name]:>7.0f} {rec['points']:>9.1f} "
+                  f"{rec['games']:>8} {rec['wins']:>7} {rec['draws']:>7} {rec['losses']:>7}")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Tournament between Tic-Tac-Toe strategies")
+    parser.add_argument("--entrants", default=",".join(sorted(STRATEGIES)),
+                        help=f"comma-separated strategy names from {sorted(STRATEGIES)}")
+    parser.add_argument("--format", choices=("roundrobin", "swiss"), default="roundrobin")
+    parser.add_argument("--rounds", type=int, default=3, help="rounds of a Swiss tournament")
+    parser.add_argument("--games-per-pair", type=int, default=100)
+    parser.add_argument("--chunk-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--k-factor", type=float, default=16.0)
+    parser.add_argument("--early-draw", action="store_true",
+                        help="end a game as a draw once no line can be completed")
+    parser.add_argument("--checkpoint", metavar="PATH", help="save progress here and resume from it")
+    parser.add_argument("--quiet", action="store_true", help="only print the final table")
+    args = parser.parse_args(argv)
+
+    entrants = [name.strip() for name in args.entrants.split(",") if name.strip()]
+    unknown = [name for name in entrants if name not in STRATEGIES]
+    if unknown or len(set(entrants)) != len(entrants) or len(entrants) < 2:
+        parser.error(f"need two or more distinct entrants from {sorted(STRATEGIES)}")
+    # Some strategies only play 3x3; find out here rather than in a worker
+    # halfway through. Building them also trains or solves any table they
+    # need once, before the workers start.
+    unsupported = []
+    for name in entrants:
+        try:
+            make_strategy(name, None, args.size, args.win_length or args.size)
+        except ValueError:
+            unsupported.append(name)
+    if unsupported:
+        parser.error(f"{', '.join(unsupported)} cannot play a {args.size}x{args.size} board "
+                     f"with win length {args.win_length or args.size}; leave them out of --entrants")
+
+    config = {
+        "entrants": entrants,
+        "format": args.format,
+        "rounds": args.rounds,
+        "games_per_pair": args.games_per_pair,
+        "chunk_size": args.chunk_size,
+        "size": args.size,
+        "win_length": args.win_length or args.size,
+        "seed": args.seed,
+        "k_factor": args.k_factor,
+        "early_draw": args.early_draw,
+    }
+    tournament = Tournament(config, args.checkpoint)
+    start = time.perf_counter()
+    start_games = tournament.games
+    try:
+        tournament.run(args.workers, progress=not args.quiet)
+    except KeyboardInterrupt:
+        print("interrupted; progress saved" if args.checkpoint else "interrupted")
+    elapsed = time.perf_counter() - start
+    tournament.report()
+    played = tournament.games - start_games
+    print(f"{played} games in {elapsed:.2f}s ({played / max(elapsed, 1e-9):,.0f} games/s "
+          f"on {args.workers} workers)")
+
+if __name__ == "__main__":
+    main()